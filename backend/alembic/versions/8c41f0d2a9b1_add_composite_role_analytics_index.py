@@ -0,0 +1,40 @@
+"""add_composite_role_analytics_index
+
+Revision ID: 8c41f0d2a9b1
+Revises: 5a8e5a48d478
+Create Date: 2026-08-31 10:15:02.481157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0d2a9b1'
+down_revision: Union[str, Sequence[str], None] = '5a8e5a48d478'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Analytics queries filter by puuid first and then by team_position, so
+    # a composite index lets the planner scan the selective puuid prefix
+    # with in-index filtering on role
+    op.create_index(
+        'ix_match_participants_puuid_team_position',
+        'match_participants',
+        ['puuid', 'team_position']
+    )
+
+    # Redundant with the composite index for the role-performance queries;
+    # single-column team_position scans are not used by any endpoint
+    op.drop_index('ix_match_participants_team_position', 'match_participants')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_match_participants_team_position', 'match_participants', ['team_position'])
+    op.drop_index('ix_match_participants_puuid_team_position', 'match_participants')
@@ -0,0 +1,35 @@
+"""add_analytics_composite_indexes
+
+Revision ID: a9c3e57d8b41
+Revises: f2b9d64e1c75
+Create Date: 2026-09-01 12:41:18.284756
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e57d8b41'
+down_revision: Union[str, Sequence[str], None] = 'f2b9d64e1c75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite indexes matching the analytics hot-path predicates
+    # (puuid range scan grouped by champion / joined on match_id; match
+    # windows filtered by game_creation then queue_id)
+    op.create_index('ix_mp_puuid_champion', 'match_participants', ['puuid', 'champion_id'], unique=False)
+    op.create_index('ix_mp_puuid_match', 'match_participants', ['puuid', 'match_id'], unique=False)
+    op.create_index('ix_match_creation_queue', 'matches', ['game_creation', 'queue_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_match_creation_queue', table_name='matches')
+    op.drop_index('ix_mp_puuid_match', table_name='match_participants')
+    op.drop_index('ix_mp_puuid_champion', table_name='match_participants')
@@ -0,0 +1,53 @@
+"""flatten_participant_items_to_columns
+
+Revision ID: b6d1f84a2c97
+Revises: a9c3e57d8b41
+Create Date: 2026-09-01 13:02:44.917263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f84a2c97'
+down_revision: Union[str, Sequence[str], None] = 'a9c3e57d8b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SLOTS = ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'trinket']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One small column per item slot replaces the JSON blob; rows read
+    # without a JSON parse and build queries can GROUP BY the columns
+    for name in _SLOTS:
+        op.add_column(
+            'match_participants',
+            sa.Column(name, sa.SmallInteger(), nullable=False, server_default='0'),
+        )
+    # Backfill from the legacy JSON dict ({"item0": ..., "item6": ...})
+    for idx, name in enumerate(_SLOTS):
+        op.execute(
+            f"UPDATE match_participants "
+            f"SET {name} = COALESCE(json_extract(items, '$.item{idx}'), 0) "
+            f"WHERE items IS NOT NULL"
+        )
+    op.drop_column('match_participants', 'items')
+    op.create_index('ix_mp_champion_item0', 'match_participants', ['champion_id', 'item0'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mp_champion_item0', table_name='match_participants')
+    op.add_column('match_participants', sa.Column('items', sa.JSON(), nullable=True))
+    op.execute(
+        "UPDATE match_participants SET items = json_object("
+        "'item0', item0, 'item1', item1, 'item2', item2, 'item3', item3, "
+        "'item4', item4, 'item5', item5, 'item6', trinket)"
+    )
+    for name in reversed(_SLOTS):
+        op.drop_column('match_participants', name)
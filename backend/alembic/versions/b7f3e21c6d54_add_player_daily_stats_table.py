@@ -0,0 +1,41 @@
+"""add_player_daily_stats_table
+
+Revision ID: b7f3e21c6d54
+Revises: 8c41f0d2a9b1
+Create Date: 2026-08-31 12:40:19.027534
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f3e21c6d54'
+down_revision: Union[str, Sequence[str], None] = '8c41f0d2a9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite has no materialized views, so daily aggregates live in a real
+    # table refreshed per player after match ingest
+    op.create_table(
+        'player_daily_stats',
+        sa.Column('puuid', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('kda_sum', sa.Float(), nullable=False),
+        sa.Column('cs_per_min_sum', sa.Float(), nullable=False),
+        sa.Column('cs_games', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('puuid', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('player_daily_stats')
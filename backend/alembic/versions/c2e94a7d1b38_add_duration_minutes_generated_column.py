@@ -0,0 +1,33 @@
+"""add_duration_minutes_generated_column
+
+Revision ID: c2e94a7d1b38
+Revises: b7f3e21c6d54
+Create Date: 2026-09-01 09:14:27.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e94a7d1b38'
+down_revision: Union[str, Sequence[str], None] = 'b7f3e21c6d54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite only allows adding VIRTUAL generated columns via ALTER TABLE;
+    # the value is computed in the database instead of a Python property
+    op.execute(
+        "ALTER TABLE matches ADD COLUMN duration_minutes FLOAT "
+        "GENERATED ALWAYS AS (round(game_duration / 60.0, 1)) VIRTUAL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE matches DROP COLUMN duration_minutes")
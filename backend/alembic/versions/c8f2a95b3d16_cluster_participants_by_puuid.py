@@ -0,0 +1,135 @@
+"""cluster_participants_by_puuid
+
+Revision ID: c8f2a95b3d16
+Revises: b6d1f84a2c97
+Create Date: 2026-09-01 13:21:37.508142
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a95b3d16'
+down_revision: Union[str, Sequence[str], None] = 'b6d1f84a2c97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Plain (non-generated) columns, in table order; shared by both copies
+_COLUMNS = """
+    match_id VARCHAR(32) NOT NULL,
+    puuid VARCHAR(78) NOT NULL,
+    participant_id SMALLINT NOT NULL,
+    team_id SMALLINT NOT NULL,
+    champion_id INTEGER NOT NULL,
+    champion_name VARCHAR(32) NOT NULL,
+    champion_level SMALLINT NOT NULL,
+    summoner_spell_1 INTEGER NOT NULL,
+    summoner_spell_2 INTEGER NOT NULL,
+    team_position VARCHAR(16),
+    individual_position VARCHAR(16),
+    role VARCHAR(16),
+    lane VARCHAR(16),
+    kills SMALLINT NOT NULL,
+    deaths SMALLINT NOT NULL,
+    assists SMALLINT NOT NULL,
+    double_kills SMALLINT NOT NULL,
+    triple_kills SMALLINT NOT NULL,
+    quadra_kills SMALLINT NOT NULL,
+    penta_kills SMALLINT NOT NULL,
+    total_damage_dealt INTEGER NOT NULL,
+    total_damage_dealt_to_champions INTEGER NOT NULL,
+    total_damage_taken INTEGER NOT NULL,
+    magic_damage_dealt INTEGER NOT NULL,
+    physical_damage_dealt INTEGER NOT NULL,
+    true_damage_dealt INTEGER NOT NULL,
+    gold_earned INTEGER NOT NULL,
+    total_minions_killed INTEGER NOT NULL,
+    neutral_minions_killed INTEGER NOT NULL,
+    vision_score INTEGER NOT NULL,
+    wards_placed SMALLINT NOT NULL,
+    wards_killed SMALLINT NOT NULL,
+    control_wards_purchased SMALLINT NOT NULL,
+    turret_kills SMALLINT NOT NULL,
+    inhibitor_kills SMALLINT NOT NULL,
+    dragon_kills SMALLINT NOT NULL,
+    baron_kills SMALLINT NOT NULL,
+    largest_killing_spree SMALLINT NOT NULL,
+    largest_multi_kill SMALLINT NOT NULL,
+    total_time_cc_dealt INTEGER NOT NULL,
+    win BOOLEAN NOT NULL,
+    game_duration_seconds INTEGER,
+    item0 SMALLINT NOT NULL DEFAULT 0,
+    item1 SMALLINT NOT NULL DEFAULT 0,
+    item2 SMALLINT NOT NULL DEFAULT 0,
+    item3 SMALLINT NOT NULL DEFAULT 0,
+    item4 SMALLINT NOT NULL DEFAULT 0,
+    item5 SMALLINT NOT NULL DEFAULT 0,
+    trinket SMALLINT NOT NULL DEFAULT 0,
+    raw_data JSON
+"""
+
+_GENERATED = """
+    kda_ratio FLOAT GENERATED ALWAYS AS (
+        CASE WHEN deaths = 0 THEN CAST(kills + assists AS REAL)
+        ELSE round(CAST(kills + assists AS REAL) / deaths, 2) END) VIRTUAL,
+    cs_per_minute FLOAT GENERATED ALWAYS AS (
+        CASE WHEN game_duration_seconds > 0
+        THEN round(total_minions_killed * 60.0 / game_duration_seconds, 1)
+        ELSE 0.0 END) VIRTUAL
+"""
+
+_COLUMN_NAMES = ", ".join(
+    line.strip().split()[0]
+    for line in _COLUMNS.strip().splitlines()
+)
+
+_FOREIGN_KEYS = """
+    FOREIGN KEY(match_id) REFERENCES matches (match_id),
+    FOREIGN KEY(puuid) REFERENCES summoners (puuid)
+"""
+
+
+def _rebuild(primary_key: str, without_rowid: bool) -> None:
+    """Copy match_participants into a rebuilt table with the given key"""
+    suffix = " WITHOUT ROWID" if without_rowid else ""
+    op.execute(
+        f"CREATE TABLE match_participants_new ({_COLUMNS}, {_GENERATED}, "
+        f"PRIMARY KEY ({primary_key}), {_FOREIGN_KEYS}){suffix}"
+    )
+    op.execute(
+        f"INSERT INTO match_participants_new ({_COLUMN_NAMES}) "
+        f"SELECT {_COLUMN_NAMES} FROM match_participants"
+    )
+    op.execute("DROP TABLE match_participants")
+    op.execute("ALTER TABLE match_participants_new RENAME TO match_participants")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rebuild with puuid leading the key and WITHOUT ROWID, so each
+    # player's rows sit contiguous in the primary B-tree - the SQLite
+    # equivalent of partitioning the table by puuid for scan locality
+    _rebuild(primary_key="puuid, match_id", without_rowid=True)
+    op.create_index('ix_mp_match_id', 'match_participants', ['match_id'], unique=False)
+    op.create_index('ix_match_participants_champion_id', 'match_participants', ['champion_id'], unique=False)
+    op.create_index('ix_match_participants_puuid_team_position', 'match_participants', ['puuid', 'team_position'], unique=False)
+    op.create_index('ix_match_participants_puuid_kda_ratio', 'match_participants', ['puuid', 'kda_ratio'], unique=False)
+    op.create_index('ix_mp_puuid_champion', 'match_participants', ['puuid', 'champion_id'], unique=False)
+    op.create_index('ix_mp_champion_item0', 'match_participants', ['champion_id', 'item0'], unique=False)
+    # (puuid, match_id) is now the primary key itself, so the composite
+    # index from the earlier revision would be pure duplication
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild(primary_key="match_id, puuid", without_rowid=False)
+    op.create_index('ix_match_participants_puuid', 'match_participants', ['puuid'], unique=False)
+    op.create_index('ix_match_participants_champion_id', 'match_participants', ['champion_id'], unique=False)
+    op.create_index('ix_match_participants_puuid_team_position', 'match_participants', ['puuid', 'team_position'], unique=False)
+    op.create_index('ix_match_participants_puuid_kda_ratio', 'match_participants', ['puuid', 'kda_ratio'], unique=False)
+    op.create_index('ix_mp_puuid_champion', 'match_participants', ['puuid', 'champion_id'], unique=False)
+    op.create_index('ix_mp_puuid_match', 'match_participants', ['puuid', 'match_id'], unique=False)
+    op.create_index('ix_mp_champion_item0', 'match_participants', ['champion_id', 'item0'], unique=False)
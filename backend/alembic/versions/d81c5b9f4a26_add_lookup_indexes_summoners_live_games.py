@@ -0,0 +1,43 @@
+"""add_lookup_indexes_summoners_live_games
+
+Revision ID: d81c5b9f4a26
+Revises: c2e94a7d1b38
+Create Date: 2026-09-01 10:02:44.871205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81c5b9f4a26'
+down_revision: Union[str, Sequence[str], None] = 'c2e94a7d1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes matching the actual lookup patterns: riot id lookups on
+    # summoners, puuid lookups on live-game tables
+    op.create_index(
+        'ix_summoners_game_name_tag_line', 'summoners',
+        ['game_name', 'tag_line']
+    )
+    op.create_index(
+        'ix_live_game_participants_puuid', 'live_game_participants',
+        ['puuid']
+    )
+    op.create_index(
+        'ix_player_live_game_history_puuid_game_id', 'player_live_game_history',
+        ['puuid', 'game_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_player_live_game_history_puuid_game_id', table_name='player_live_game_history')
+    op.drop_index('ix_live_game_participants_puuid', table_name='live_game_participants')
+    op.drop_index('ix_summoners_game_name_tag_line', table_name='summoners')
@@ -0,0 +1,64 @@
+"""add_participant_derived_stat_columns
+
+Revision ID: e4a7c28f9d13
+Revises: d81c5b9f4a26
+Create Date: 2026-09-01 10:41:17.254908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c28f9d13'
+down_revision: Union[str, Sequence[str], None] = 'd81c5b9f4a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Denormalize the match duration onto participants so the per-minute
+    # rate below doesn't need a join, then backfill existing rows
+    op.add_column(
+        'match_participants',
+        sa.Column('game_duration_seconds', sa.Integer(), nullable=True)
+    )
+    op.execute(
+        "UPDATE match_participants SET game_duration_seconds = ("
+        "SELECT game_duration FROM matches "
+        "WHERE matches.match_id = match_participants.match_id)"
+    )
+
+    # Derived stat columns; SQLite's ALTER TABLE only supports VIRTUAL
+    # generated columns, which can still back indexes and SQL aggregates
+    op.execute(
+        "ALTER TABLE match_participants ADD COLUMN kda_ratio FLOAT "
+        "GENERATED ALWAYS AS ("
+        "CASE WHEN deaths = 0 THEN CAST(kills + assists AS REAL) "
+        "ELSE round(CAST(kills + assists AS REAL) / deaths, 2) END"
+        ") VIRTUAL"
+    )
+    op.execute(
+        "ALTER TABLE match_participants ADD COLUMN cs_per_minute FLOAT "
+        "GENERATED ALWAYS AS ("
+        "CASE WHEN game_duration_seconds > 0 "
+        "THEN round(total_minions_killed * 60.0 / game_duration_seconds, 1) "
+        "ELSE 0.0 END"
+        ") VIRTUAL"
+    )
+
+    op.create_index(
+        'ix_match_participants_puuid_kda_ratio', 'match_participants',
+        ['puuid', 'kda_ratio']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_match_participants_puuid_kda_ratio', table_name='match_participants')
+    op.execute("ALTER TABLE match_participants DROP COLUMN cs_per_minute")
+    op.execute("ALTER TABLE match_participants DROP COLUMN kda_ratio")
+    op.drop_column('match_participants', 'game_duration_seconds')
@@ -0,0 +1,48 @@
+"""add_player_champion_stats_table
+
+Revision ID: f2b9d64e1c75
+Revises: e4a7c28f9d13
+Create Date: 2026-09-01 11:07:52.610341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9d64e1c75'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c28f9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-champion companion to player_daily_stats; champion performance
+    # endpoints read these small rows instead of re-grouping participants
+    op.create_table(
+        'player_champion_stats',
+        sa.Column('puuid', sa.String(), nullable=False),
+        sa.Column('champion_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('champion_name', sa.String(), nullable=False),
+        sa.Column('games', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('kills_sum', sa.Integer(), nullable=False),
+        sa.Column('deaths_sum', sa.Integer(), nullable=False),
+        sa.Column('assists_sum', sa.Integer(), nullable=False),
+        sa.Column('cs_per_min_sum', sa.Float(), nullable=False),
+        sa.Column('cs_games', sa.Integer(), nullable=False),
+        sa.Column('damage_sum', sa.Float(), nullable=False),
+        sa.Column('vision_sum', sa.Float(), nullable=False),
+        sa.Column('last_played', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('puuid', 'champion_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('player_champion_stats')
@@ -4,9 +4,14 @@ from app.api.v1.endpoints import summoners, matches, analytics, champion_mastery
 
 api_router = APIRouter()
 
-# Include all endpoint routers
-api_router.include_router(summoners.router, prefix="/summoners", tags=["summoners"])
-api_router.include_router(matches.router, prefix="/matches", tags=["matches"])
-api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
-api_router.include_router(champion_mastery.router, prefix="/champion-mastery", tags=["champion-mastery"])
-api_router.include_router(live_games.router, prefix="/live-games", tags=["live-games"]) 
\ No newline at end of file
+# Single data-driven registry of endpoint routers - add new modules here
+ROUTERS = [
+    ("/summoners", summoners.router, "summoners"),
+    ("/matches", matches.router, "matches"),
+    ("/analytics", analytics.router, "analytics"),
+    ("/champion-mastery", champion_mastery.router, "champion-mastery"),
+    ("/live-games", live_games.router, "live-games"),
+]
+
+for prefix, router, tag in ROUTERS:
+    api_router.include_router(router, prefix=prefix, tags=[tag])
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import hashlib
+import json
+import time
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.cache_decorator import cached
 from app.services.analytics_service import AnalyticsService
 from app.services.rate_limiter import rate_limiter
+from app.services.concurrency_limiter import concurrency_guard
 from app.services.cache_service import cache_manager, cache
 from app.schemas.analytics import (
     AnalyticsRequest,
@@ -19,22 +29,70 @@ from app.schemas.analytics import (
 
 router = APIRouter()
 
+# Positions accepted by the role benchmark endpoints
+VALID_ROLES = frozenset({"TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"})
+
+
+async def _with_own_session(service_call, *args):
+    """
+    Run an AnalyticsService call with its own database session.
+
+    AsyncSession is not safe for concurrent use, so each task launched via
+    asyncio.gather gets a fresh session from the session factory.
+    """
+    async with AsyncSessionLocal() as session:
+        return await service_call(session, *args)
+
+
+def _data_etag(*parts) -> str:
+    """Build a short ETag from the data version components"""
+    raw = ":".join(str(part) for part in parts)
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()}"'
+
+
+@cached(ttl=300, key="analytics:overview:{puuid}:{days}")
+async def _build_player_overview(db: AsyncSession, *, puuid: str, days: int) -> PlayerOverviewStats:
+    """Build the overview payload (cached per puuid/days)"""
+    stats = await AnalyticsService.get_player_overview_stats(db, puuid, days)
+    # Internally computed data is already trusted - skip per-field validation
+    return PlayerOverviewStats.model_construct(**stats)
+
 
 @router.get("/overview/{puuid}", response_model=PlayerOverviewStats)
 async def get_player_overview(
     puuid: str,
+    request: Request,
+    response: Response,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get overview statistics for a player"""
     try:
-        stats = await AnalyticsService.get_player_overview_stats(db, puuid, days)
-        return PlayerOverviewStats(**stats)
-    except Exception as e:
+        # ETag from the newest stored match: polls between syncs get a
+        # bodyless 304 instead of the full payload
+        version = await AnalyticsService.get_latest_match_time(db, puuid)
+        etag = _data_etag(puuid, days, version)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, max-age=60"
+
+        result = await _build_player_overview(db, puuid=puuid, days=days)
+        if isinstance(result, Response):
+            # Cache hits come back as a prebuilt Response, which bypasses the
+            # injected response's headers - attach the validators directly
+            result.headers["ETag"] = etag
+            result.headers["Cache-Control"] = "private, max-age=60"
+        return result
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get overview stats: {str(e)}")
 
 
 @router.get("/champions/{puuid}", response_model=List[ChampionPerformance])
+@cached(ttl=300, key="analytics:champions:{puuid}:{days}")
 async def get_champion_performance(
     puuid: str,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
@@ -43,12 +101,16 @@ async def get_champion_performance(
     """Get per-champion performance statistics"""
     try:
         performance = await AnalyticsService.get_champion_performance(db, puuid, days)
-        return [ChampionPerformance(**champ) for champ in performance]
-    except Exception as e:
+        return [ChampionPerformance.model_construct(**champ) for champ in performance]
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get champion performance: {str(e)}")
 
 
 @router.get("/gpi/{puuid}", response_model=GPIMetrics)
+@cached(ttl=300, key="analytics:gpi:{puuid}:{days}")
 async def get_gpi_metrics(
     puuid: str,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
@@ -57,86 +119,186 @@ async def get_gpi_metrics(
     """Get GPI-style performance metrics (0-10 scale)"""
     try:
         metrics = await AnalyticsService.get_gpi_metrics(db, puuid, days)
-        return GPIMetrics(**metrics)
-    except Exception as e:
+        return GPIMetrics.model_construct(**metrics)
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get GPI metrics: {str(e)}")
 
 
+# Comprehensive responses are cached for this long; generated_at is aligned
+# to the same bucket so a cached payload always matches its timestamp
+COMPREHENSIVE_TTL_SECONDS = 600
+
+
+@cached(ttl=COMPREHENSIVE_TTL_SECONDS, key="analytics:comprehensive:{puuid}:{days}")
+async def _build_comprehensive_analytics(puuid: str, days: int) -> ComprehensiveAnalytics:
+    """Build the comprehensive analytics payload (cached per puuid/days)"""
+    # Fetch all analytics data concurrently - each task runs on its own
+    # session so total latency is the slowest query, not the sum of all five
+    (
+        overview_stats,
+        champion_performance,
+        performance_trends,
+        gpi_metrics,
+        recent_matches
+    ) = await asyncio.gather(
+        _with_own_session(AnalyticsService.get_player_overview_stats, puuid, days),
+        _with_own_session(AnalyticsService.get_champion_performance, puuid, days),
+        _with_own_session(AnalyticsService.get_performance_trends, puuid, days),
+        _with_own_session(AnalyticsService.get_gpi_metrics, puuid, days),
+        _with_own_session(AnalyticsService.get_recent_match_performance, puuid, 10)
+    )
+
+    # Timestamp is rounded down to the cache bucket instead of datetime.now()
+    # so repeat requests within the TTL serve a byte-identical payload
+    bucket = int(time.time()) // COMPREHENSIVE_TTL_SECONDS * COMPREHENSIVE_TTL_SECONDS
+
+    # The sub-results are computed internally, so build the response with
+    # model_construct instead of double-validating already-trusted data
+    return ComprehensiveAnalytics.model_construct(
+        puuid=puuid,
+        overview_stats=PlayerOverviewStats.model_construct(**overview_stats),
+        champion_performance=[ChampionPerformance.model_construct(**champ) for champ in champion_performance],
+        performance_trends=PerformanceTrends.model_construct(**performance_trends),
+        gpi_metrics=GPIMetrics.model_construct(**gpi_metrics),
+        recent_matches=[RecentMatchPerformance.model_construct(**match) for match in recent_matches],
+        generated_at=datetime.fromtimestamp(bucket, tz=timezone.utc)
+    )
+
+
 @router.get("/comprehensive/{puuid}", response_model=ComprehensiveAnalytics)
 async def get_comprehensive_analytics(
     puuid: str,
+    request: Request,
+    response: Response,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    _: None = Depends(concurrency_guard)
 ):
     """Get comprehensive analytics combining all metrics"""
     try:
-        # Fetch all analytics data
-        overview_stats = await AnalyticsService.get_player_overview_stats(db, puuid, days)
-        champion_performance = await AnalyticsService.get_champion_performance(db, puuid, days)
-        performance_trends = await AnalyticsService.get_performance_trends(db, puuid, days)
-        gpi_metrics = await AnalyticsService.get_gpi_metrics(db, puuid, days)
-        recent_matches = await AnalyticsService.get_recent_match_performance(db, puuid, 10)
-        
-        return ComprehensiveAnalytics(
-            puuid=puuid,
-            overview_stats=PlayerOverviewStats(**overview_stats),
-            champion_performance=[ChampionPerformance(**champ) for champ in champion_performance],
-            performance_trends=PerformanceTrends(**performance_trends),
-            gpi_metrics=GPIMetrics(**gpi_metrics),
-            recent_matches=[RecentMatchPerformance(**match) for match in recent_matches],
-            generated_at=datetime.now()
-        )
-    except Exception as e:
+        # Weak ETag derived from the cache bucket - clients holding a fresh
+        # copy get a bodyless 304 instead of the full payload
+        bucket = int(time.time()) // COMPREHENSIVE_TTL_SECONDS * COMPREHENSIVE_TTL_SECONDS
+        etag = f'W/"{puuid}:{days}:{bucket}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        result = await _build_comprehensive_analytics(puuid=puuid, days=days)
+        if isinstance(result, Response):
+            # Cache hits come back as a prebuilt Response, which bypasses the
+            # injected response's headers - attach the validator directly
+            result.headers["ETag"] = etag
+        return result
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get comprehensive analytics: {str(e)}")
 
 
+@router.get("/comprehensive-stream/{puuid}")
+async def stream_comprehensive_analytics(
+    puuid: str,
+    days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+    _: None = Depends(concurrency_guard)
+):
+    """
+    Stream comprehensive analytics as server-sent events
+
+    Each section is emitted as soon as its query resolves, so the dashboard
+    can render cards progressively instead of waiting on the slowest query.
+    The monolithic /comprehensive endpoint remains available for clients
+    that want a single payload.
+    """
+    async def run_named(name, service_call, *args):
+        try:
+            return name, await _with_own_session(service_call, *args)
+        except Exception as e:
+            return name, {"error": str(e)}
+
+    async def event_generator():
+        tasks = [
+            run_named("overview_stats", AnalyticsService.get_player_overview_stats, puuid, days),
+            run_named("champion_performance", AnalyticsService.get_champion_performance, puuid, days),
+            run_named("performance_trends", AnalyticsService.get_performance_trends, puuid, days),
+            run_named("gpi_metrics", AnalyticsService.get_gpi_metrics, puuid, days),
+            run_named("recent_matches", AnalyticsService.get_recent_match_performance, puuid, 10),
+        ]
+
+        for future in asyncio.as_completed(tasks):
+            name, data = await future
+            yield f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+        yield f"event: complete\ndata: {json.dumps({'puuid': puuid})}\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @router.get("/activity/{puuid}")
+@cached(ttl=300, key="analytics:activity:{puuid}:{days}")
 async def get_activity_heatmap(
     puuid: str,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(concurrency_guard)
 ):
     """Get activity heatmap data showing gaming patterns by day and hour"""
     try:
         activity_data = await AnalyticsService.get_activity_heatmap(db, puuid, days)
         return activity_data
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get activity heatmap: {str(e)}")
 
 
 @router.get("/roles/{puuid}")
+@cached(ttl=300, key="analytics:roles:{puuid}:{days}")
 async def get_role_performance(
     puuid: str,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(concurrency_guard)
 ):
     """Get performance statistics broken down by role/position"""
     try:
         role_data = await AnalyticsService.get_role_performance(db, puuid, days)
         return role_data
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get role performance: {str(e)}")
 
 
 @router.get("/roles/{puuid}/{role}")
+@cached(ttl=300, key="analytics:role-benchmarks:{puuid}:{role}:{days}")
 async def get_role_benchmarks(
     puuid: str,
     role: str,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(concurrency_guard)
 ):
     """Get detailed benchmarks and recommendations for a specific role"""
     try:
         # Validate role
-        valid_roles = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
-        if role.upper() not in valid_roles:
-            raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {valid_roles}")
-        
-        benchmark_data = await AnalyticsService.get_role_benchmarks(db, puuid, role.upper(), days)
+        role_upper = role.upper()
+        if role_upper not in VALID_ROLES:
+            raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {sorted(VALID_ROLES)}")
+
+        benchmark_data = await AnalyticsService.get_role_benchmarks(db, puuid, role_upper, days)
         return benchmark_data
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get role benchmarks: {str(e)}")
 
 
@@ -146,7 +308,10 @@ async def get_rate_limit_status():
     try:
         status = rate_limiter.get_rate_limit_status()
         return status
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get rate limit status: {str(e)}")
 
 
@@ -156,7 +321,10 @@ async def get_cache_status():
     try:
         status = await cache_manager.get_cache_status()
         return status
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to get cache status: {str(e)}")
 
 
@@ -166,7 +334,10 @@ async def clear_cache():
     try:
         await cache.clear()
         return {"message": "Cache cleared successfully"}
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear cache: {str(e)}")
 
 
@@ -174,11 +345,12 @@ async def clear_cache():
 async def clear_analytics_cache():
     """Clear only analytics cache entries"""
     try:
-        # For now, clear all cache since we don't have pattern-based deletion
-        # In production with Redis, you'd use pattern matching
-        await cache.clear()
-        return {"message": "Analytics cache cleared successfully"}
-    except Exception as e:
+        removed_count = await cache.invalidate_pattern("analytics:*")
+        return {"message": f"Analytics cache cleared successfully ({removed_count} entries)"}
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear analytics cache: {str(e)}")
 
 
@@ -188,7 +360,10 @@ async def cleanup_cache():
     try:
         removed_count = await cache.cleanup_expired()
         return {"message": f"Cleaned up {removed_count} expired cache entries"}
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to cleanup cache: {str(e)}")
 
 
@@ -198,5 +373,8 @@ async def invalidate_user_cache(puuid: str):
     try:
         await cache_manager.invalidate_user_cache(puuid)
         return {"message": f"Cache invalidated for user {puuid}"}
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to invalidate cache: {str(e)}")
\ No newline at end of file
@@ -1,4 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import hashlib
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
@@ -18,22 +24,43 @@ from app.services.champion_data_service import ChampionDataService
 router = APIRouter()
 
 
+def _data_etag(*parts) -> str:
+    """Build a short ETag from the data version components"""
+    raw = ":".join(str(part) for part in parts)
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()}"'
+
+
 @router.get("/{puuid}", response_model=ChampionMasteryListResponse)
 async def get_champion_masteries(
     puuid: str,
+    request: Request,
+    response: Response,
     limit: Optional[int] = Query(None, description="Limit number of masteries returned"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get champion masteries for a summoner"""
     try:
+        # ETag from max(updated_at): unchanged data gets a bodyless 304
+        # instead of re-serializing the full list on every dashboard poll
+        version = await ChampionMasteryService.get_masteries_version(db, puuid)
+        etag = _data_etag(puuid, limit, version)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, max-age=60"
+
         masteries = await ChampionMasteryService.get_top_masteries(db, puuid, limit or 50)
-        
-        return ChampionMasteryListResponse(
-            masteries=[ChampionMasteryResponse(**mastery) for mastery in masteries],
+
+        # The dicts come from our own DB rows, so skip re-validation
+        return ChampionMasteryListResponse.model_construct(
+            masteries=[ChampionMasteryResponse.model_construct(**mastery) for mastery in masteries],
             total_count=len(masteries)
         )
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch champion masteries: {str(e)}")
 
 
@@ -47,7 +74,10 @@ async def get_mastery_summary(
         summary = await ChampionMasteryService.get_mastery_stats_summary(db, puuid)
         return ChampionMasterySummaryResponse(**summary)
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch mastery summary: {str(e)}")
 
 
@@ -78,19 +108,34 @@ async def sync_champion_masteries(
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to sync masteries: {str(e)}")
 
 
 @router.get("/{puuid}/enhanced", response_model=ChampionMasteryEnhancedResponse)
 async def get_enhanced_masteries(
     puuid: str,
+    request: Request,
+    response: Response,
     limit: Optional[int] = Query(10, description="Limit number of masteries returned"),
     days: Optional[int] = Query(30, description="Days to look back for performance data"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get champion masteries enhanced with performance data from recent matches"""
     try:
+        # Version the payload by both mastery updates and newest stored match,
+        # since either changing invalidates the enhanced view
+        mastery_version = await ChampionMasteryService.get_masteries_version(db, puuid)
+        match_version = await AnalyticsService.get_latest_match_time(db, puuid)
+        etag = _data_etag(puuid, limit, days, mastery_version, match_version)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, max-age=60"
+
         # Get mastery data
         masteries = await ChampionMasteryService.get_top_masteries(db, puuid, limit)
         summary = await ChampionMasteryService.get_mastery_stats_summary(db, puuid)
@@ -98,53 +143,58 @@ async def get_enhanced_masteries(
         # Get champion performance data
         try:
             champion_performance = await AnalyticsService.get_champion_performance(db, puuid, days)
-        except Exception:
+        except SQLAlchemyError:
             # Return empty performance data to continue
             champion_performance = []
-        
+
         # Create a lookup for champion performance
         try:
             performance_lookup = {cp["champion_id"]: cp for cp in champion_performance}
-        except Exception:
+        except (KeyError, TypeError):
             performance_lookup = {}
         
+        # Resolve all missing champion names in one batched call instead of
+        # one lookup per mastery row
+        missing_ids = {
+            mastery["champion_id"] for mastery in masteries
+            if not performance_lookup.get(mastery["champion_id"], {}).get("champion_name")
+        }
+        name_map = await ChampionDataService.get_champion_names_by_ids(missing_ids)
+
+        # Precompute performance tuples so the loop body does one dict lookup
+        # per row instead of ten .get() calls; None means no performance data
+        no_performance = (None, None, None, None, None, None, None)
+        perf_by_id = {
+            cp["champion_id"]: (
+                cp.get("total_games"),
+                cp.get("wins"),
+                cp.get("losses"),
+                cp.get("win_rate"),
+                cp.get("avg_kda"),
+                cp.get("avg_cs_per_min"),
+                cp.get("last_played")
+            )
+            for cp in champion_performance
+        }
+
         # Enhance masteries with performance data
         enhanced_masteries = []
         for mastery in masteries:
             try:
-                perf_data = performance_lookup.get(mastery["champion_id"], {})
-                
-                # Get champion name from performance data or dynamically fetch it
-                champion_name = perf_data.get("champion_name")
-                if not champion_name:
-                    champion_name = await ChampionDataService.get_champion_name_by_id(mastery["champion_id"])
-                
-                # Ensure we always have a valid champion name
-                if not champion_name or champion_name.startswith("Champion "):
-                    champion_name = await ChampionDataService.get_champion_name_by_id(mastery["champion_id"])
-                
-                # Handle performance data - use None for no data instead of 0
-                if perf_data:
-                    # We have performance data for this champion
-                    total_games = perf_data.get("total_games")
-                    wins = perf_data.get("wins")
-                    losses = perf_data.get("losses")
-                    win_rate = perf_data.get("win_rate")
-                    avg_kda = perf_data.get("avg_kda")
-                    avg_cs_per_min = perf_data.get("avg_cs_per_min")
-                    last_played_match = perf_data.get("last_played").isoformat() if perf_data.get("last_played") else None
-                else:
-                    # No performance data available - use None for all fields
-                    total_games = None
-                    wins = None
-                    losses = None
-                    win_rate = None
-                    avg_kda = None
-                    avg_cs_per_min = None
-                    last_played_match = None
-                
-                enhanced_mastery = ChampionMasteryWithPerformance(
-                        champion_id=mastery["champion_id"],
+                champion_id = mastery["champion_id"]
+                total_games, wins, losses, win_rate, avg_kda, avg_cs_per_min, last_played = (
+                    perf_by_id.get(champion_id, no_performance)
+                )
+
+                # Get champion name from performance data or the batched lookup
+                champion_name = (
+                    performance_lookup.get(champion_id, {}).get("champion_name")
+                    or name_map.get(champion_id)
+                )
+
+                # Internally assembled data - build without re-validation
+                enhanced_mastery = ChampionMasteryWithPerformance.model_construct(
+                        champion_id=champion_id,
                         champion_name=champion_name,
                         mastery_level=mastery["mastery_level"],
                         mastery_points=mastery["mastery_points"],
@@ -159,10 +209,12 @@ async def get_enhanced_masteries(
                         win_rate=win_rate,
                         avg_kda=avg_kda,
                         avg_cs_per_min=avg_cs_per_min,
-                        last_played_match=last_played_match
+                        last_played_match=last_played
                 )
                 enhanced_masteries.append(enhanced_mastery)
-            except Exception:
+            except (KeyError, TypeError, AttributeError):
+                # Skip rows with malformed mastery/performance data rather
+                # than failing the whole listing
                 continue
         
         response = ChampionMasteryEnhancedResponse(
@@ -172,7 +224,10 @@ async def get_enhanced_masteries(
         )
         return response
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch enhanced masteries: {str(e)}")
 
 
@@ -189,19 +244,23 @@ async def get_champion_mastery(
         if not mastery:
             raise HTTPException(status_code=404, detail="Champion mastery not found")
         
-        return ChampionMasteryResponse(
+        # Trusted ORM row - no need to re-run field validators
+        return ChampionMasteryResponse.model_construct(
             champion_id=mastery.champion_id,
             mastery_level=mastery.mastery_level,
             mastery_points=mastery.mastery_points,
             points_until_next_level=mastery.points_until_next_level,
             chest_granted=mastery.chest_granted,
             tokens_earned=mastery.tokens_earned,
-            last_play_time=mastery.last_play_time.isoformat() if mastery.last_play_time else None,
+            last_play_time=mastery.last_play_time,
             mastery_progress_percentage=mastery.mastery_progress_percentage,
-            updated_at=mastery.updated_at.isoformat() if mastery.updated_at else None
+            updated_at=mastery.updated_at
         )
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch champion mastery: {str(e)}")
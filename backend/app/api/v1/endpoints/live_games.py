@@ -1,20 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+import bisect
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
 from app.services.live_game_service import LiveGameService
+from app.services.riot_client import RiotClient, get_riot_client
 from app.services.build_recommendations_service import BuildRecommendationsService
 from app.services.cache_service import cache_manager
 from app.models.summoner import Summoner
+from app.schemas.live_game import LiveGameMonitorResponse, MonitorParams
 from sqlalchemy import select
 
 router = APIRouter()
 
+# Live status freshness window: serve cached for this long, then refresh in
+# the background while still answering from the stale copy
+LIVE_STATUS_SOFT_TTL = 20
+LIVE_STATUS_STALE_TTL = 60
+LIVE_STATUS_CACHE_CONTROL = f"max-age={LIVE_STATUS_SOFT_TTL}, stale-while-revalidate={LIVE_STATUS_STALE_TTL}"
+
+# Game-time thresholds (minutes) for phase/objective labels; bisect keeps
+# the lookup a single comparison pass and new cutoffs become one-line edits
+_PHASE_BINS = (15, 30)
+_PHASES = ("early", "mid", "late")
+_OBJECTIVE_BINS = (5, 20)
+_OBJECTIVES = ("First Dragon", "Herald/Dragon", "Baron/Elder Dragon")
+
+
+def _live_status_factory(puuid: str, region: str):
+    """Build a refresh callable that owns its session, safe to run after the response"""
+    async def fetch_status():
+        async with AsyncSessionLocal() as session:
+            return await LiveGameService.check_player_live_status(session, puuid, region)
+    return fetch_status
+
+
+async def _get_cached_live_status(puuid: str, region: str, background_tasks: Optional[BackgroundTasks]):
+    """Shared live-status lookup with stale-while-revalidate caching"""
+    return await cache_manager.get_or_refresh(
+        f"live_games:status:{puuid}:{region}",
+        _live_status_factory(puuid, region),
+        soft_ttl_seconds=LIVE_STATUS_SOFT_TTL,
+        stale_ttl_seconds=LIVE_STATUS_STALE_TTL,
+        background_tasks=background_tasks
+    )
+
 
 @router.get("/status/{puuid}")
 async def get_live_game_status(
     puuid: str,
+    background_tasks: BackgroundTasks,
     region: str = "na1",
     db: AsyncSession = Depends(get_db)
 ):
@@ -41,87 +83,105 @@ async def get_live_game_status(
                 detail="Summoner not found. Please sync summoner data first."
             )
         
-        # Get live game status with caching
-        live_status = await LiveGameService.get_live_game_status(db, puuid, region)
-        
-        return {
-            "success": True,
-            "data": live_status,
-            "region": region,
-            "summoner": {
-                "puuid": summoner.puuid,
-                "game_name": summoner.game_name,
-                "tag_line": summoner.tag_line,
-                "riot_id": summoner.riot_id,
-                "region": summoner.region
-            }
-        }
+        # Get live game status with stale-while-revalidate caching
+        live_status = await _get_cached_live_status(puuid, region, background_tasks)
+
+        # Polled every few seconds per viewer: serialize straight through
+        # orjson instead of walking the nested payload with FastAPI's
+        # encoder first (headers must ride along - returning a Response
+        # skips the injected response object)
+        return ORJSONResponse(
+            {
+                "success": True,
+                "data": live_status,
+                "region": region,
+                "summoner": {
+                    "puuid": summoner.puuid,
+                    "game_name": summoner.game_name,
+                    "tag_line": summoner.tag_line,
+                    "riot_id": summoner.riot_id,
+                    "region": summoner.region
+                }
+            },
+            headers={"Cache-Control": LIVE_STATUS_CACHE_CONTROL},
+        )
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error checking live game status: {str(e)}")
 
 
-@router.get("/monitor")
+# response_model documents the payload (including per-player error
+# entries) in OpenAPI; the handler returns a prebuilt ORJSONResponse, so
+# no validation pass runs on the hot path
+@router.get("/monitor", response_model=LiveGameMonitorResponse)
 async def monitor_multiple_players(
-    puuids: str,  # Comma-separated list of PUUIDs
-    region: str = "na1",
+    params: Annotated[MonitorParams, Query()],
     db: AsyncSession = Depends(get_db)
 ):
     """
     Monitor multiple players for live games (useful for teams/friends)
-    
+
     Args:
-        puuids: Comma-separated list of PUUIDs to monitor
-        region: Region for API calls
-        
+        params: Validated query parameters (puuids list of 1-10, region)
+
     Returns:
         Dictionary with live game status for each player
     """
     try:
-        puuid_list = [puuid.strip() for puuid in puuids.split(",") if puuid.strip()]
-        
-        if not puuid_list:
-            raise HTTPException(status_code=400, detail="No valid PUUIDs provided")
-        
-        if len(puuid_list) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 players can be monitored at once")
-        
+        # Parsing and the 1-10 bound are enforced by MonitorParams before
+        # the handler runs (invalid input is a 422, not a raise here)
+        puuid_list = params.puuids
+        region = params.region
+
+        # Load every monitored summoner in one IN query instead of one
+        # round trip per player inside the service
+        result = await db.execute(
+            select(Summoner).where(Summoner.puuid.in_(puuid_list))
+        )
+        summoners_by_puuid = {s.puuid: s for s in result.scalars().all()}
+
         # Monitor all players
-        results = await LiveGameService.monitor_player_games(db, puuid_list, region)
+        results = await LiveGameService.monitor_player_games(
+            db, puuid_list, region, summoners_by_puuid=summoners_by_puuid
+        )
         
-        return {
+        # Polled in a refresh loop; same direct-orjson path as /status
+        return ORJSONResponse({
             "success": True,
             "data": results,
             "region": region,
             "monitored_count": len(puuid_list)
-        }
+        })
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error monitoring players: {str(e)}")
 
 
 @router.get("/featured-games")
 async def get_featured_games(
     region: str = "na1",
-    db: AsyncSession = Depends(get_db)
+    riot_client: RiotClient = Depends(get_riot_client)
 ):
     """
     Get featured games (high MMR/streamer games) from Riot API
-    
+
     Args:
         region: Region for API calls
-        
+
     Returns:
         List of featured games
     """
     try:
-        from app.services.riot_client import RiotClient
-        
-        riot_client = RiotClient()
         featured_games = await riot_client.get_featured_games(region)
         
         if not featured_games:
@@ -140,15 +200,19 @@ async def get_featured_games(
             "region": region
         }
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error fetching featured games: {str(e)}")
 
 
 @router.post("/analyze-enemy/{puuid}")
 async def analyze_enemy_team(
     puuid: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     region: str = "na1",
-    background_tasks: BackgroundTasks = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -162,15 +226,17 @@ async def analyze_enemy_team(
         Detailed enemy team analysis with counter strategies
     """
     try:
-        # First check if player is in a live game
-        live_status = await LiveGameService.get_live_game_status(db, puuid, region)
-        
+        # First check if player is in a live game (shared cached lookup)
+        live_status = await _get_cached_live_status(puuid, region, background_tasks)
+
         if not live_status or not live_status.get("is_in_game"):
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail="Player is not currently in a live game"
             )
-        
+
+        response.headers["Cache-Control"] = LIVE_STATUS_CACHE_CONTROL
+
         # Return the enemy analysis from the live status
         enemy_analysis = live_status.get("enemy_analysis", {})
         recommendations = live_status.get("recommendations", {})
@@ -188,13 +254,18 @@ async def analyze_enemy_team(
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing enemy team: {str(e)}")
 
 
 @router.get("/recommendations/{puuid}")
 async def get_live_game_recommendations(
     puuid: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     region: str = "na1",
     db: AsyncSession = Depends(get_db)
 ):
@@ -209,15 +280,17 @@ async def get_live_game_recommendations(
         Real-time recommendations for items, strategy, warding, etc.
     """
     try:
-        # Check if player is in live game
-        live_status = await LiveGameService.get_live_game_status(db, puuid, region)
-        
+        # Check if player is in live game (shared cached lookup)
+        live_status = await _get_cached_live_status(puuid, region, background_tasks)
+
         if not live_status or not live_status.get("is_in_game"):
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail="Player is not currently in a live game"
             )
-        
+
+        response.headers["Cache-Control"] = LIVE_STATUS_CACHE_CONTROL
+
         recommendations = live_status.get("recommendations", {})
         game_info = live_status.get("game_info", {})
         
@@ -229,26 +302,85 @@ async def get_live_game_recommendations(
             "data": {
                 "recommendations": recommendations,
                 "game_time_minutes": game_length_minutes,
-                "game_phase": (
-                    "early" if game_length_minutes < 15 
-                    else "mid" if game_length_minutes < 30 
-                    else "late"
-                ),
-                "next_major_objective": (
-                    "First Dragon" if game_length_minutes < 5
-                    else "Herald/Dragon" if game_length_minutes < 20
-                    else "Baron/Elder Dragon"
-                )
+                "game_phase": _PHASES[bisect.bisect(_PHASE_BINS, game_length_minutes)],
+                "next_major_objective": _OBJECTIVES[bisect.bisect(_OBJECTIVE_BINS, game_length_minutes)]
             },
             "region": region
         }
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
 
 
+@router.get("/snapshot/{puuid}")
+async def get_live_game_snapshot(
+    puuid: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    region: str = "na1",
+    include_build: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Composite live-game snapshot: enemy analysis, recommendations, team
+    composition and (optionally) build recommendations in one response
+
+    Lets the frontend poll a single endpoint instead of hitting
+    analyze-enemy, recommendations and build-recommendations separately;
+    all fields come from the same shared cached lookup.
+
+    Args:
+        puuid: Player PUUID
+        region: Region for API calls
+        include_build: Also compute build recommendations when in game
+
+    Returns:
+        Combined live game snapshot (is_in_game False when not in game)
+    """
+    try:
+        live_status = await _get_cached_live_status(puuid, region, background_tasks)
+        response.headers["Cache-Control"] = LIVE_STATUS_CACHE_CONTROL
+
+        if not live_status or not live_status.get("is_in_game"):
+            return {
+                "success": True,
+                "data": {"is_in_game": False},
+                "region": region
+            }
+
+        data = {
+            "is_in_game": True,
+            "game_info": live_status.get("game_info"),
+            "enemy_analysis": live_status.get("enemy_analysis", {}),
+            "recommendations": live_status.get("recommendations", {}),
+            "team_composition": live_status.get("team_composition")
+        }
+
+        if include_build:
+            game_id = (live_status.get("game_info") or {}).get("game_id")
+            if game_id:
+                data["build_recommendations"] = await BuildRecommendationsService.get_cached_build_recommendations(
+                    db, puuid, game_id
+                )
+
+        return {
+            "success": True,
+            "data": data,
+            "region": region
+        }
+
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
+        raise HTTPException(status_code=500, detail=f"Error building live game snapshot: {str(e)}")
+
+
 @router.post("/clear-cache")
 async def clear_live_game_cache(
     puuid: Optional[str] = None
@@ -273,7 +405,10 @@ async def clear_live_game_cache(
             "message": message
         }
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error clearing cache: {str(e)}")
 
 
@@ -290,13 +425,18 @@ async def get_cache_status():
             "data": cache_status
         }
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error getting cache status: {str(e)}")
 
 
 @router.get("/build-recommendations/{puuid}")
 async def get_build_recommendations(
     puuid: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     region: str = "na1",
     db: AsyncSession = Depends(get_db)
 ):
@@ -311,15 +451,17 @@ async def get_build_recommendations(
         Build recommendations based on enemy team composition and game state
     """
     try:
-        # First check if player is in a live game
-        live_status = await LiveGameService.get_live_game_status(db, puuid, region)
-        
+        # First check if player is in a live game (shared cached lookup)
+        live_status = await _get_cached_live_status(puuid, region, background_tasks)
+
         if not live_status or not live_status.get("is_in_game"):
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail="Player is not currently in a live game"
             )
-        
+
+        response.headers["Cache-Control"] = LIVE_STATUS_CACHE_CONTROL
+
         game_id = live_status.get("game_info", {}).get("game_id")
         if not game_id:
             raise HTTPException(
@@ -341,7 +483,10 @@ async def get_build_recommendations(
         
     except HTTPException:
         raise
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error getting build recommendations: {str(e)}")
 
 
@@ -1,7 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import logging
+import sys
+
+import httpx
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.schemas.match import (
     MatchHistoryResponse, 
@@ -10,11 +20,25 @@ from app.schemas.match import (
     MatchParticipantResponse,
     PlayerMatchPerformance
 )
+from app.services.analytics_service import AnalyticsService
 from app.services.match_service import MatchService
 from app.services.summoner_service import SummonerService
+from app.services.cache_service import cache_manager
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+
+def _log_exception(message: str, exc_info) -> None:
+    """Format and log a captured exception outside the request path
+
+    Traceback formatting is synchronous and can take milliseconds on deep
+    stacks; running it as a background task keeps the event loop free while
+    the error response goes out.
+    """
+    logger.error(message, exc_info=exc_info)
+
 
 @router.get("/{puuid}", response_model=MatchHistoryResponse)
 async def get_match_history(
@@ -41,35 +65,29 @@ async def get_match_history(
         
         # Fetch new matches if requested
         if fetch_new:
-            print(f"🔄 Fetching new matches for {puuid} from Riot API...")
+            logger.debug("Fetching new matches for %s from Riot API", puuid)
             await MatchService.fetch_and_store_recent_matches(db, puuid, region, limit)
+            # New matches invalidate the cached analytics responses and the
+            # pre-aggregated daily/champion stats
+            await cache_manager.invalidate_user_cache(puuid)
+            await AnalyticsService.refresh_player_daily_stats(db, puuid)
+            await AnalyticsService.refresh_player_champion_stats(db, puuid)
         
-        # Get matches from database
-        matches = await MatchService.get_matches_by_puuid(db, puuid, limit)
-        
-        # Convert to response format
-        match_responses = []
-        for match in matches:
-            match_response = MatchResponse(
-                match_id=match.match_id,
-                game_creation=match.game_creation,
-                game_duration=match.game_duration,
-                duration_minutes=match.duration_minutes,
-                game_mode=match.game_mode,
-                game_type=match.game_type,
-                map_id=match.map_id,
-                queue_id=match.queue_id,
-                winning_team=match.winning_team
-            )
-            match_responses.append(match_response)
-        
+        # Get this page of matches plus the player's real total in one query
+        matches, total_matches = await MatchService.get_matches_by_puuid(db, puuid, limit)
+
+        # Validate straight from the ORM rows (from_attributes) instead of
+        # copying every column into keyword arguments by hand
         return MatchHistoryResponse(
             puuid=puuid,
-            total_matches=len(match_responses),
-            matches=match_responses
+            total_matches=total_matches,
+            matches=[MatchResponse.model_validate(match) for match in matches]
         )
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving match history: {str(e)}")
 
 
@@ -88,40 +106,44 @@ async def get_player_match_performance(
         if not summoner:
             raise HTTPException(status_code=404, detail="Summoner not found")
         
-        # Get matches with participant data
-        matches = await MatchService.get_matches_by_puuid(db, puuid, limit)
-        
-        performance_data = []
-        for match in matches:
-            # Get participant data for this player in this match
-            participant = await MatchService.get_match_participant(db, match.match_id, puuid)
-            if participant:
-                performance = PlayerMatchPerformance(
-                    match_id=match.match_id,
-                    champion_name=participant.champion_name,
-                    kills=participant.kills,
-                    deaths=participant.deaths,
-                    assists=participant.assists,
-                    kda_ratio=participant.kda_ratio,
-                    cs=participant.total_minions_killed,
-                    gold_earned=participant.gold_earned,
-                    damage_to_champions=participant.total_damage_dealt_to_champions,
-                    vision_score=participant.vision_score,
-                    win=participant.win,
-                    game_duration_minutes=match.duration_minutes,
-                    game_creation=match.game_creation
-                )
-                performance_data.append(performance)
-        
-        return performance_data
+        # Get matches joined with this player's participant rows in a single
+        # query instead of one participant lookup per match
+        rows = await MatchService.get_player_performance_rows(db, puuid, limit)
+
+        # Pure-data payload from columns SQLAlchemy already typed; returning
+        # a Response directly hands the dicts straight to orjson, skipping
+        # both re-validation and the jsonable_encoder walk (response_model
+        # stays for the OpenAPI schema)
+        return ORJSONResponse([
+            {
+                "match_id": row.match_id,
+                "champion_name": row.champion_name,
+                "kills": row.kills,
+                "deaths": row.deaths,
+                "assists": row.assists,
+                "kda_ratio": row.kda_ratio,
+                "cs": row.total_minions_killed,
+                "gold_earned": row.gold_earned,
+                "damage_to_champions": row.total_damage_dealt_to_champions,
+                "vision_score": row.vision_score,
+                "win": row.win,
+                "game_duration_minutes": row.duration_minutes,
+                "game_creation": row.game_creation
+            }
+            for row in rows
+        ])
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving player performance: {str(e)}")
 
 
 @router.get("/detail/{match_id}", response_model=MatchResponse)
 async def get_match_detail(
     match_id: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     include_participants: bool = Query(True, description="Include participant data")
 ):
@@ -129,16 +151,15 @@ async def get_match_detail(
     Get detailed information about a specific match
     """
     try:
-        print(f"🔍 Fetching match details for match_id: {match_id}")
+        logger.debug("Fetching match details for match_id: %s", match_id)
         match = await MatchService.get_match_with_participants(db, match_id)
         if not match:
-            print(f"❌ Match not found in database: {match_id}")
+            logger.debug("Match not found in database: %s", match_id)
             raise HTTPException(status_code=404, detail="Match not found")
         
-        print(f"✅ Found match: {match.match_id}")
-        
-        # Create base response
-        match_response = MatchResponse(
+        # Build straight from trusted DB columns - model_construct skips the
+        # validator chain that would just re-check types SQLAlchemy enforced
+        match_response = MatchResponse.model_construct(
             match_id=match.match_id,
             game_creation=match.game_creation,
             game_duration=match.game_duration,
@@ -154,12 +175,14 @@ async def get_match_detail(
         if include_participants:
             participants = []
             try:
-                # Fetch participants using the service method to avoid async issues
-                participant_list = await MatchService.get_participants_by_match_id(db, match_id)
-                print(f"🔍 Found {len(participant_list)} participants for match {match_id}")
+                # Participants were eagerly loaded by selectinload in
+                # get_match_with_participants - no second round trip needed
+                participant_list = match.participants
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found %d participants for match %s", len(participant_list), match_id)
                 
                 for participant in participant_list:
-                    participant_response = MatchParticipantResponse(
+                    participant_response = MatchParticipantResponse.model_construct(
                         puuid=participant.puuid,
                         participant_id=participant.participant_id,
                         team_id=participant.team_id,
@@ -179,52 +202,68 @@ async def get_match_detail(
                     )
                     participants.append(participant_response)
                 
-                print(f"✅ Successfully processed {len(participants)} participants")
                 match_response.participants = participants
-                
-            except Exception as participant_error:
-                print(f"❌ Error processing participants: {str(participant_error)}")
-                import traceback
-                traceback.print_exc()
-                # If participants fail, still return the match without participants
-                print("⚠️ Returning match without participants due to error")
+
+            except (SQLAlchemyError, ValidationError, AttributeError):
+                # If participants fail, still return the match without
+                # participants; traceback formatting runs after the response
+                background_tasks.add_task(
+                    _log_exception,
+                    f"Processing participants failed for match {match_id}",
+                    sys.exc_info()
+                )
         
         return match_response
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
         raise
-    except Exception as e:
-        print(f"❌ Unexpected error in get_match_detail: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
+        # Background tasks don't run when the handler raises, so push the
+        # formatting onto an executor thread instead
+        asyncio.get_running_loop().run_in_executor(
+            None, _log_exception, f"Error retrieving match details for {match_id}", sys.exc_info()
+        )
         raise HTTPException(status_code=500, detail=f"Error retrieving match details: {str(e)}")
 
 
-@router.get("/debug/list-matches", response_model=List[str])
-async def list_all_matches(
-    db: AsyncSession = Depends(get_db),
-    limit: int = Query(10, ge=1, le=100, description="Number of matches to list")
-):
-    """
-    Debug endpoint to list all match IDs in the database
-    """
-    try:
-        from sqlalchemy import select
-        from app.models.match import Match
-        
-        result = await db.execute(
-            select(Match.match_id)
-            .order_by(Match.game_creation.desc())
-            .limit(limit)
-        )
-        match_ids = result.scalars().all()
-        print(f"🔍 Found {len(match_ids)} matches in database: {match_ids}")
-        return match_ids
-        
-    except Exception as e:
-        print(f"❌ Error listing matches: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error listing matches: {str(e)}")
+if settings.DEBUG:
+    # Only mounted in debug builds - no route registration or per-request
+    # surface in production processes
+    @router.get("/debug/list-matches", response_model=List[str])
+    async def list_all_matches(
+        db: AsyncSession = Depends(get_db),
+        limit: int = Query(10, ge=1, le=100, description="Number of matches to list")
+    ):
+        """
+        Debug endpoint to list all match IDs in the database
+        """
+        try:
+            from sqlalchemy import select
+            from app.models.match import Match
+
+            # Stream instead of buffering the whole result set, so raising
+            # the limit later doesn't mean one big allocation
+            stream = await db.stream_scalars(
+                select(Match.match_id)
+                .order_by(Match.game_creation.desc())
+                .limit(limit)
+                .execution_options(yield_per=100)
+            )
+            match_ids = [match_id async for match_id in stream]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %d matches in database: %s", len(match_ids), match_ids)
+            return match_ids
+
+        except asyncio.CancelledError:
+            # Never convert request cancellation into a 500
+            raise
+        except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
+            logger.exception("Error listing matches")
+            raise HTTPException(status_code=500, detail=f"Error listing matches: {str(e)}")
 
 
 @router.get("/debug/match-participants/{match_id}")
@@ -243,21 +282,31 @@ async def debug_match_participants(
         
         # Get participants separately
         participants = await MatchService.get_participants_by_match_id(db, match_id)
-        
-        return {
-            "match_id": match_id,
-            "match_exists": True,
-            "participants_count": len(participants),
-            "participants": [
-                {
+
+        # Stream orjson fragments instead of building the whole payload and
+        # serializing it in one event-loop pass
+        async def stream():
+            yield (
+                b'{"match_id":' + orjson.dumps(match_id)
+                + b',"match_exists":true,"participants_count":'
+                + orjson.dumps(len(participants))
+                + b',"participants":['
+            )
+            for index, p in enumerate(participants):
+                fragment = orjson.dumps({
                     "puuid": p.puuid,
                     "champion_name": p.champion_name,
                     "team_id": p.team_id,
                     "participant_id": p.participant_id
-                } for p in participants
-            ]
-        }
+                })
+                yield fragment if index == 0 else b"," + fragment
+            yield b"]}"
+
+        return StreamingResponse(stream(), media_type="application/json")
         
-    except Exception as e:
-        print(f"❌ Error debugging match participants: {str(e)}")
-        return {"error": str(e), "match_id": match_id} 
\ No newline at end of file
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
+        logger.exception("Error debugging match participants for %s", match_id)
+        return {"error": str(e), "match_id": match_id}
\ No newline at end of file
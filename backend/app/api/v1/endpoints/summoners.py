@@ -1,27 +1,80 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import hashlib
+import logging
+from typing import Dict
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.schemas.summoner import SummonerCreate, SummonerCreateByRiotId, SummonerResponse
-from app.services.riot_client import RiotClient
+from app.services.cache_service import cache
+from app.services.riot_client import RiotClient, get_riot_client
 from app.services.summoner_service import SummonerService
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# Riot account/summoner data moves slowly; a short TTL removes repeated
+# upstream round trips without serving meaningfully stale profiles
+RIOT_LOOKUP_TTL_SECONDS = 60
+
+
+# Coalesces concurrent identical lookups: the first caller does the Riot
+# round trip, duplicates await the same future (same pattern as the cached
+# endpoint decorator)
+_inflight_lookups: Dict[str, asyncio.Future] = {}
+
+
+async def _fetch_summoner_info_coalesced(key: str, riot_client: RiotClient, summoner_data) -> dict:
+    """Fetch summoner info from Riot, sharing one call across concurrent requests"""
+    existing = _inflight_lookups.get(key)
+    if existing is not None:
+        # Shield so one cancelled waiter doesn't kill the shared fetch
+        return await asyncio.shield(existing)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_lookups[key] = future
+    try:
+        summoner_info = await riot_client.get_summoner_by_riot_id(
+            summoner_data.game_name, summoner_data.tag_line, summoner_data.region
+        )
+        if summoner_info:
+            await cache.set(key, summoner_info, RIOT_LOOKUP_TTL_SECONDS)
+        future.set_result(summoner_info)
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved in case no waiter consumes it
+        raise
+    finally:
+        _inflight_lookups.pop(key, None)
+    return summoner_info
+
+
+def _summoner_etag(puuid: str, revision_date) -> str:
+    """Version tag for a summoner response; changes when Riot bumps revisionDate"""
+    raw = f"{puuid}:{revision_date}"
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
 
 @router.post("/lookup", response_model=SummonerResponse)
 async def lookup_summoner(
     summoner_data: SummonerCreate,
     db: AsyncSession = Depends(get_db),
+    riot_client: RiotClient = Depends(get_riot_client),
 ):
     """
     Look up a summoner by name and region
-    
+
     **DEPRECATED**: This endpoint uses the deprecated Summoner by-name API which may return 403 errors.
     Use `/lookup-by-riot-id` instead with Riot ID format (gameName#tagLine).
     """
     try:
-        riot_client = RiotClient()
         summoner_info = await riot_client.get_summoner_by_name(
             summoner_data.name, summoner_data.region
         )
@@ -39,14 +92,19 @@ async def lookup_summoner(
             level=summoner_info["summonerLevel"],
             region=summoner_data.region,
         )
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error looking up summoner: {str(e)}")
 
 
 @router.post("/lookup-by-riot-id", response_model=SummonerResponse)
 async def lookup_summoner_by_riot_id(
     summoner_data: SummonerCreateByRiotId,
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    riot_client: RiotClient = Depends(get_riot_client),
 ):
     """
     Look up a summoner by Riot ID (gameName#tagLine) and region
@@ -61,39 +119,84 @@ async def lookup_summoner_by_riot_id(
     4. Return summoner information
     """
     try:
-        # First, check if we have this summoner in our database
-        existing_summoner = await SummonerService.get_summoner_by_riot_id(
-            db, summoner_data.game_name, summoner_data.tag_line
+        # Serve identical lookups from the TTL cache before hitting Riot
+        cache_key = (
+            f"riot:riotid:{summoner_data.region}:"
+            f"{summoner_data.game_name.lower()}#{summoner_data.tag_line.lower()}"
         )
-        
-        # Always fetch fresh data from Riot API for now (later we can add caching logic)
-        riot_client = RiotClient()
-        summoner_info = await riot_client.get_summoner_by_riot_id(
-            summoner_data.game_name, summoner_data.tag_line, summoner_data.region
-        )
-        print(f"SUMMONER INFO: {summoner_info}")
-        
+        summoner_info = await cache.get(cache_key)
+        if summoner_info is None:
+            # The stored summoner is only a stale-on-error fallback and a
+            # revision check, so the DB read can overlap the much slower Riot
+            # round trip (Riot calls don't touch the session) and a Core row
+            # is enough - no ORM hydration needed
+            existing_task = asyncio.create_task(
+                SummonerService.get_summoner_row_by_riot_id(
+                    db, summoner_data.game_name, summoner_data.tag_line
+                )
+            )
+            try:
+                summoner_info = await _fetch_summoner_info_coalesced(
+                    cache_key, riot_client, summoner_data
+                )
+            except (ValueError, httpx.HTTPError):
+                # Riot is rate limiting or down - serve the stored summoner
+                # rather than failing the lookup outright
+                existing_summoner = await existing_task
+                if existing_summoner:
+                    return SummonerService.summoner_to_response(existing_summoner)
+                raise
+            # Settle the hint before any early return so the task isn't
+            # left dangling
+            existing_summoner = await existing_task
+        else:
+            # Cache hit: the payload was stored on the preceding miss, so the
+            # DB row is current and the revision check below skips the upsert
+            existing_summoner = await SummonerService.get_summoner_row_by_riot_id(
+                db, summoner_data.game_name, summoner_data.tag_line
+            )
+        logger.debug("Summoner info fetched for %s#%s", summoner_data.game_name, summoner_data.tag_line)
+
         if not summoner_info:
             raise HTTPException(status_code=404, detail="Summoner not found")
-        
-        # Store or update summoner in database
-        stored_summoner = await SummonerService.create_or_update_summoner(
-            db=db,
-            puuid=summoner_info["puuid"],
-            game_name=summoner_info.get("gameName"),
-            tag_line=summoner_info.get("tagLine"),
-            summoner_level=summoner_info["summonerLevel"],
-            revision_date=summoner_info["revisionDate"],
-            region=summoner_data.region,
-            profile_icon_id=summoner_info.get("profileIconId")
+
+        # Skip the upsert (the most expensive SQLite operation here) when
+        # Riot's revisionDate matches what we already stored
+        if existing_summoner and existing_summoner.revision_date == summoner_info["revisionDate"]:
+            stored_summoner = existing_summoner
+        else:
+            # Store or update summoner in database
+            stored_summoner = await SummonerService.create_or_update_summoner(
+                db=db,
+                puuid=summoner_info["puuid"],
+                game_name=summoner_info.get("gameName"),
+                tag_line=summoner_info.get("tagLine"),
+                summoner_level=summoner_info["summonerLevel"],
+                revision_date=summoner_info["revisionDate"],
+                region=summoner_data.region,
+                profile_icon_id=summoner_info.get("profileIconId")
+            )
+
+
+        logger.debug("Stored summoner %s", stored_summoner.puuid)
+
+        # Clients polling the same Riot ID get a 304 until revisionDate moves
+        etag = _summoner_etag(stored_summoner.puuid, stored_summoner.revision_date)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+
+        # Returning a pre-serialized response skips FastAPI's second
+        # validation pass against response_model; the DTO was just built
+        # from data we validated on the way in
+        return ORJSONResponse(
+            SummonerService.summoner_to_response(stored_summoner).model_dump(),
+            headers={"ETag": etag, "Cache-Control": "private, max-age=30"},
         )
         
-        print(f"STORED SUMMONER: {stored_summoner.to_dict()}")
-        
-        # Return the response using our service converter
-        return SummonerService.summoner_to_response(stored_summoner)
-        
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error looking up summoner: {str(e)}")
 
 
@@ -110,5 +213,8 @@ async def get_summoner(puuid: str, db: AsyncSession = Depends(get_db)):
         
         return SummonerService.summoner_to_response(summoner)
         
-    except Exception as e:
+    except asyncio.CancelledError:
+        # Never convert request cancellation into a 500
+        raise
+    except (SQLAlchemyError, httpx.HTTPError, ValidationError) as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving summoner: {str(e)}")
\ No newline at end of file
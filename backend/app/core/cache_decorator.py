@@ -0,0 +1,73 @@
+import asyncio
+from functools import wraps
+from typing import Dict
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.services.cache_service import cache
+
+# In-flight computations keyed by cache key. When a cache entry expires under
+# concurrent traffic, only the first request recomputes; the rest await its
+# future instead of stampeding the database with duplicate query fan-outs.
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _serialize_response(value) -> bytes:
+    """Serialize an endpoint return value to JSON bytes once, at cache time"""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode()
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        return b"[" + b",".join(item.model_dump_json().encode() for item in value) + b"]"
+    return orjson.dumps(value, default=str)
+
+
+def cached(ttl: int = 300, key: str = ""):
+    """
+    Decorator to cache endpoint responses in the shared cache service
+
+    Responses are serialized to JSON bytes once when cached, so hits skip
+    the database queries, Pydantic serialization and JSON encoding entirely
+    and just hand the stored bytes to the client. Concurrent misses on the
+    same key are coalesced so only one coroutine does the work (singleflight).
+
+    Args:
+        ttl: Time to live in seconds for cached responses
+        key: Format string built from the endpoint's keyword arguments,
+             e.g. "analytics:overview:{puuid}:{days}"
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key.format(**kwargs)
+
+            cached_body = await cache.get(cache_key)
+            if cached_body is not None:
+                return Response(
+                    content=cached_body,
+                    media_type="application/json",
+                    headers={"X-Cache": "HIT"}
+                )
+
+            # Someone else is already computing this key - wait for them
+            existing = _inflight.get(cache_key)
+            if existing is not None:
+                return await asyncio.shield(existing)
+
+            future = asyncio.get_running_loop().create_future()
+            _inflight[cache_key] = future
+            try:
+                response = await func(*args, **kwargs)
+                await cache.set(cache_key, _serialize_response(response), ttl)
+                future.set_result(response)
+                return response
+            except BaseException as e:
+                future.set_exception(e)
+                # Mark the exception as retrieved in case no one is waiting
+                future.exception()
+                raise
+            finally:
+                _inflight.pop(cache_key, None)
+        return wrapper
+    return decorator
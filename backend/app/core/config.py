@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     # CORS Configuration
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:1420"]
     
+    # Storage Configuration
+    # Raw Riot payloads (participant raw_data, match teams_data) are cold
+    # archival data; disable once the typed columns are trusted to keep
+    # match rows narrow and backups small
+    STORE_RAW_PAYLOADS: bool = True
+
     # Development Configuration
     DEBUG: bool = True
     
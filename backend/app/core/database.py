@@ -1,24 +1,58 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import orjson
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
-# Create async engine
+def _json_serializer(value) -> str:
+    """Serialize JSON column values with orjson (SQLite stores JSON as TEXT)"""
+    return orjson.dumps(value).decode()
+
+
+# Create async engine; connections are pooled so the per-connection open
+# and pragma setup below is paid once, not per request. The JSON columns
+# (match raw_data, live-game perks/snapshots, ...) are large and re-parsed
+# on every read, so they go through orjson instead of the stdlib codec
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
+    pool_size=8,
+    max_overflow=4,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
-# Create async session factory
-AsyncSessionLocal = sessionmaker(
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Configure each pooled SQLite connection once when it is created
+
+        WAL lets readers run during writes, synchronous=NORMAL drops the
+        per-commit fsync WAL doesn't need, and the cache/temp settings keep
+        hot pages and sorts in memory.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# Create async session factory; expire_on_commit=False keeps ORM objects
+# readable after a commit without a re-SELECT per attribute access
+AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
-# Create declarative base
-Base = declarative_base()
+# Declarative base; 2.0-style so models use Mapped[] / mapped_column
+class Base(DeclarativeBase):
+    pass
 
 
 async def get_db() -> AsyncSession:
@@ -26,5 +60,10 @@ async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         try:
             yield session
+        except SQLAlchemyError:
+            # Roll back on database errors so the connection goes back to
+            # the pool clean instead of stuck in a failed transaction
+            await session.rollback()
+            raise
         finally:
             await session.close() 
\ No newline at end of file
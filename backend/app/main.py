@@ -1,10 +1,21 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.services.cache_service import cache_manager
+from app.services.riot_client import RiotClient, RiotRateLimitError
+
+
+# Configure logging once at startup; endpoint modules use
+# logging.getLogger(__name__) with lazy formatting
+logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO)
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -13,8 +24,9 @@ async def lifespan(app: FastAPI):
     await cache_manager.start_cleanup_task(interval_seconds=300)  # Clean every 5 minutes
     print("🚀 Started cache cleanup task")
     yield
-    # Shutdown: Stop cache cleanup task
+    # Shutdown: Stop cache cleanup task and close the shared Riot HTTP pool
     await cache_manager.stop_cleanup_task()
+    await RiotClient.aclose()
     print("🛑 Stopped cache cleanup task")
 
 
@@ -24,20 +36,45 @@ app = FastAPI(
     version="0.1.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
+    # orjson serializes the bulky analytics/mastery payloads several times
+    # faster than the stdlib json path
+    default_response_class=ORJSONResponse,
 )
 
-# Set up CORS for frontend communication
+# Set up CORS for frontend communication; origins come from settings so
+# deployments can change them without touching code. Explicit methods and
+# headers keep preflight responses small (no "*" expansion), and the
+# pre-compiled regex admits any local dev port (Tauri, Vite, ...)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:1420"],  # Tauri dev server
+    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$",
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.exception_handler(RiotRateLimitError)
+async def riot_rate_limit_handler(request: Request, exc: RiotRateLimitError):
+    """Pass persistent Riot 429s through as 429s so clients can back off"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Riot API rate limit exceeded"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Centralized 500 handler for exceptions the endpoints don't expect"""
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
 @app.get("/")
 async def root():
     return {"message": "GG-Sync API is running!"}
@@ -2,14 +2,18 @@ from .summoner import Summoner
 from .match import Match, MatchParticipant
 from .champion_mastery import ChampionMastery
 from .live_game import LiveGame, LiveGameParticipant, LiveGameSnapshot, PlayerLiveGameHistory
+from .player_daily_stats import PlayerDailyStats
+from .player_champion_stats import PlayerChampionStats
 
 __all__ = [
-    "Summoner", 
-    "Match", 
-    "MatchParticipant", 
+    "Summoner",
+    "Match",
+    "MatchParticipant",
     "ChampionMastery",
     "LiveGame",
-    "LiveGameParticipant", 
+    "LiveGameParticipant",
     "LiveGameSnapshot",
-    "PlayerLiveGameHistory"
+    "PlayerLiveGameHistory",
+    "PlayerDailyStats",
+    "PlayerChampionStats"
 ]
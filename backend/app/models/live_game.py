@@ -1,6 +1,9 @@
-from sqlalchemy import Column, String, Integer, DateTime, JSON, Boolean, ForeignKey, Float
-from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import String, Integer, DateTime, JSON, Boolean, ForeignKey, Float, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
 from app.core.database import Base
 
 
@@ -9,31 +12,31 @@ class LiveGame(Base):
     Model for storing live/active game data from Riot Spectator API
     """
     __tablename__ = "live_games"
-    
+
     # Primary identification
-    game_id = Column(String, primary_key=True)  # Riot's gameId for the live game
-    platform_id = Column(String, nullable=False)  # Platform identifier (NA1, EUW1, etc.)
-    
+    game_id: Mapped[str] = mapped_column(String, primary_key=True)  # Riot's gameId for the live game
+    platform_id: Mapped[str] = mapped_column(String)  # Platform identifier (NA1, EUW1, etc.)
+
     # Game metadata
-    game_type = Column(String, nullable=True)  # Game type
-    game_mode = Column(String, nullable=True)  # Game mode (CLASSIC, ARAM, etc.)
-    map_id = Column(Integer, nullable=True)  # Map ID (11 = Summoner's Rift)
-    queue_id = Column(Integer, nullable=True)  # Queue type
-    
+    game_type: Mapped[Optional[str]] = mapped_column(String)  # Game type
+    game_mode: Mapped[Optional[str]] = mapped_column(String)  # Game mode (CLASSIC, ARAM, etc.)
+    map_id: Mapped[Optional[int]] = mapped_column(Integer)  # Map ID (11 = Summoner's Rift)
+    queue_id: Mapped[Optional[int]] = mapped_column(Integer)  # Queue type
+
     # Timing information
-    game_start_time = Column(DateTime, nullable=True)  # When the game started
-    game_length = Column(Integer, nullable=True)  # Current game length in seconds
-    last_updated = Column(DateTime, default=datetime.utcnow)  # When we last updated this data
-    
+    game_start_time: Mapped[Optional[datetime]] = mapped_column(DateTime)  # When the game started
+    game_length: Mapped[Optional[int]] = mapped_column(Integer)  # Current game length in seconds
+    last_updated: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)  # When we last updated this data
+
     # Game state
-    is_active = Column(Boolean, default=True)  # Whether this game is still active
-    spectator_delay = Column(Integer, nullable=True)  # Spectator delay in seconds
-    
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)  # Whether this game is still active
+    spectator_delay: Mapped[Optional[int]] = mapped_column(Integer)  # Spectator delay in seconds
+
     # Raw data from Riot API for future analysis
-    raw_data = Column(JSON, nullable=True)
-    
+    raw_data: Mapped[Optional[dict]] = mapped_column(JSON)
+
     # Relationships
-    participants = relationship("LiveGameParticipant", back_populates="live_game", cascade="all, delete-orphan")
+    participants: Mapped[List["LiveGameParticipant"]] = relationship("LiveGameParticipant", back_populates="live_game", cascade="all, delete-orphan")
 
 
 class LiveGameParticipant(Base):
@@ -41,43 +44,47 @@ class LiveGameParticipant(Base):
     Model for storing individual player data in a live game
     """
     __tablename__ = "live_game_participants"
-    
+    __table_args__ = (
+        # Build recommendations look participants up by puuid
+        Index("ix_live_game_participants_puuid", "puuid"),
+    )
+
     # Composite primary key
-    game_id = Column(String, ForeignKey("live_games.game_id"), primary_key=True)
-    summoner_id = Column(String, primary_key=True)  # Riot summoner ID
-    
+    game_id: Mapped[str] = mapped_column(String, ForeignKey("live_games.game_id"), primary_key=True)
+    summoner_id: Mapped[str] = mapped_column(String, primary_key=True)  # Riot summoner ID
+
     # Player identification
-    puuid = Column(String, nullable=True)  # PUUID if available
-    summoner_name = Column(String, nullable=True)
-    summoner_level = Column(Integer, nullable=True)
-    
+    puuid: Mapped[Optional[str]] = mapped_column(String)  # PUUID if available
+    summoner_name: Mapped[Optional[str]] = mapped_column(String)
+    summoner_level: Mapped[Optional[int]] = mapped_column(Integer)
+
     # Team and position
-    team_id = Column(Integer, nullable=False)  # 100 (Blue) or 200 (Red)
-    position = Column(String, nullable=True)  # TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY
-    
+    team_id: Mapped[int] = mapped_column(Integer)  # 100 (Blue) or 200 (Red)
+    position: Mapped[Optional[str]] = mapped_column(String)  # TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY
+
     # Champion and spells
-    champion_id = Column(Integer, nullable=True)
-    spell1_id = Column(Integer, nullable=True)  # Summoner spell 1
-    spell2_id = Column(Integer, nullable=True)  # Summoner spell 2
-    
+    champion_id: Mapped[Optional[int]] = mapped_column(Integer)
+    spell1_id: Mapped[Optional[int]] = mapped_column(Integer)  # Summoner spell 1
+    spell2_id: Mapped[Optional[int]] = mapped_column(Integer)  # Summoner spell 2
+
     # Runes and perks
-    perk_main_style = Column(Integer, nullable=True)  # Primary rune tree
-    perk_sub_style = Column(Integer, nullable=True)   # Secondary rune tree
-    perks = Column(JSON, nullable=True)  # Complete perk/rune data
-    
+    perk_main_style: Mapped[Optional[int]] = mapped_column(Integer)  # Primary rune tree
+    perk_sub_style: Mapped[Optional[int]] = mapped_column(Integer)   # Secondary rune tree
+    perks: Mapped[Optional[dict]] = mapped_column(JSON)  # Complete perk/rune data
+
     # Game bans (if applicable)
-    banned_champion_id = Column(Integer, nullable=True)
-    
+    banned_champion_id: Mapped[Optional[int]] = mapped_column(Integer)
+
     # Player performance tracking (for our analytics)
-    estimated_rank = Column(String, nullable=True)  # Estimated rank based on match history
-    win_rate_with_champion = Column(Float, nullable=True)  # Win rate with this champion
-    average_kda = Column(Float, nullable=True)  # Average KDA
-    
+    estimated_rank: Mapped[Optional[str]] = mapped_column(String)  # Estimated rank based on match history
+    win_rate_with_champion: Mapped[Optional[float]] = mapped_column(Float)  # Win rate with this champion
+    average_kda: Mapped[Optional[float]] = mapped_column(Float)  # Average KDA
+
     # Raw participant data
-    raw_data = Column(JSON, nullable=True)
-    
+    raw_data: Mapped[Optional[dict]] = mapped_column(JSON)
+
     # Relationship
-    live_game = relationship("LiveGame", back_populates="participants")
+    live_game: Mapped["LiveGame"] = relationship("LiveGame", back_populates="participants")
 
 
 class LiveGameSnapshot(Base):
@@ -85,34 +92,34 @@ class LiveGameSnapshot(Base):
     Model for storing snapshots of live game data for analysis
     """
     __tablename__ = "live_game_snapshots"
-    
+
     # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
     # Reference to live game
-    game_id = Column(String, ForeignKey("live_games.game_id"), nullable=False)
-    
+    game_id: Mapped[str] = mapped_column(String, ForeignKey("live_games.game_id"))
+
     # Snapshot metadata
-    snapshot_time = Column(DateTime, default=datetime.utcnow)
-    game_time = Column(Integer, nullable=True)  # Game time in seconds when snapshot taken
-    
+    snapshot_time: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    game_time: Mapped[Optional[int]] = mapped_column(Integer)  # Game time in seconds when snapshot taken
+
     # Team analysis
-    blue_team_analysis = Column(JSON, nullable=True)  # Analysis of blue team composition/performance
-    red_team_analysis = Column(JSON, nullable=True)   # Analysis of red team composition/performance
-    
+    blue_team_analysis: Mapped[Optional[dict]] = mapped_column(JSON)  # Analysis of blue team composition/performance
+    red_team_analysis: Mapped[Optional[dict]] = mapped_column(JSON)   # Analysis of red team composition/performance
+
     # Match predictions
-    win_probability_blue = Column(Float, nullable=True)  # Predicted win % for blue team
-    win_probability_red = Column(Float, nullable=True)   # Predicted win % for red team
-    
+    win_probability_blue: Mapped[Optional[float]] = mapped_column(Float)  # Predicted win % for blue team
+    win_probability_red: Mapped[Optional[float]] = mapped_column(Float)   # Predicted win % for red team
+
     # Enemy scouting data
-    enemy_team_threats = Column(JSON, nullable=True)    # Analysis of enemy team threats
-    recommended_strategies = Column(JSON, nullable=True) # Recommended strategies/builds
-    
+    enemy_team_threats: Mapped[Optional[dict]] = mapped_column(JSON)    # Analysis of enemy team threats
+    recommended_strategies: Mapped[Optional[dict]] = mapped_column(JSON) # Recommended strategies/builds
+
     # Performance insights
-    performance_insights = Column(JSON, nullable=True)  # Real-time insights and recommendations
-    
+    performance_insights: Mapped[Optional[dict]] = mapped_column(JSON)  # Real-time insights and recommendations
+
     # Raw snapshot data
-    raw_data = Column(JSON, nullable=True)
+    raw_data: Mapped[Optional[dict]] = mapped_column(JSON)
 
 
 class PlayerLiveGameHistory(Base):
@@ -120,27 +127,31 @@ class PlayerLiveGameHistory(Base):
     Model for tracking a player's live game detection history
     """
     __tablename__ = "player_live_game_history"
-    
+    __table_args__ = (
+        # History checks filter by player and game together
+        Index("ix_player_live_game_history_puuid_game_id", "puuid", "game_id"),
+    )
+
     # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
     # Player identification
-    puuid = Column(String, nullable=False, index=True)
-    summoner_id = Column(String, nullable=False)
-    
+    puuid: Mapped[str] = mapped_column(String, index=True)
+    summoner_id: Mapped[str] = mapped_column(String)
+
     # Live game reference
-    game_id = Column(String, ForeignKey("live_games.game_id"), nullable=False)
-    
+    game_id: Mapped[str] = mapped_column(String, ForeignKey("live_games.game_id"))
+
     # Detection metadata
-    detected_at = Column(DateTime, default=datetime.utcnow)
-    game_start_detected = Column(DateTime, nullable=True)
-    game_end_detected = Column(DateTime, nullable=True)
-    
+    detected_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    game_start_detected: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    game_end_detected: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
     # Game outcome (filled after game ends)
-    final_result = Column(String, nullable=True)  # "WIN", "LOSS", "REMAKE", etc.
-    final_kda = Column(String, nullable=True)     # Final KDA after game
-    final_match_id = Column(String, nullable=True) # Match ID once game is completed
-    
+    final_result: Mapped[Optional[str]] = mapped_column(String)  # "WIN", "LOSS", "REMAKE", etc.
+    final_kda: Mapped[Optional[str]] = mapped_column(String)     # Final KDA after game
+    final_match_id: Mapped[Optional[str]] = mapped_column(String) # Match ID once game is completed
+
     # Analysis data
-    pre_game_analysis = Column(JSON, nullable=True)  # Analysis before/during game
-    post_game_analysis = Column(JSON, nullable=True) # Analysis after game completion
+    pre_game_analysis: Mapped[Optional[dict]] = mapped_column(JSON)  # Analysis before/during game
+    post_game_analysis: Mapped[Optional[dict]] = mapped_column(JSON) # Analysis after game completion
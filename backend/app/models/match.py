@@ -1,61 +1,77 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Float, JSON, ForeignKey, Text
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import Computed, String, Integer, SmallInteger, DateTime, Boolean, Float, Index, JSON, ForeignKey, PrimaryKeyConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    # Only for the relationship annotations below; the mapper resolves the
+    # string references from its registry, so no runtime import is needed
+    from app.models.summoner import Summoner
+
 
 class Match(Base):
     """Match model - stores League of Legends match information"""
     __tablename__ = "matches"
+    __table_args__ = (
+        # Recent-match windows filter on game_creation then queue_id
+        Index("ix_match_creation_queue", "game_creation", "queue_id"),
+    )
 
     # Primary identifier
-    match_id = Column(String, primary_key=True, index=True, doc="Riot match ID")
-    
+    match_id: Mapped[str] = mapped_column(String(32), primary_key=True, index=True, doc="Riot match ID")
+
     # Match metadata
-    game_creation = Column(DateTime(timezone=True), nullable=False, index=True, doc="When the match was created")
-    game_start = Column(DateTime(timezone=True), nullable=True, doc="When the match started")
-    game_end = Column(DateTime(timezone=True), nullable=True, doc="When the match ended")
-    game_duration = Column(Integer, nullable=False, doc="Match duration in seconds")
-    
+    game_creation: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, doc="When the match was created")
+    game_start: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), doc="When the match started")
+    game_end: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), doc="When the match ended")
+    game_duration: Mapped[int] = mapped_column(Integer, doc="Match duration in seconds")
+    # Generated in the database so responses read it straight off the row
+    # instead of dispatching a Python property per match
+    duration_minutes: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed("round(game_duration / 60.0, 1)"),
+        doc="Match duration in minutes (generated from game_duration)"
+    )
+
     # Game information
-    game_mode = Column(String, nullable=False, doc="Game mode (e.g., CLASSIC, ARAM)")
-    game_type = Column(String, nullable=False, doc="Game type (e.g., MATCHED_GAME)")
-    game_version = Column(String, nullable=False, doc="Game client version")
-    map_id = Column(Integer, nullable=False, doc="Map ID (11=Summoner's Rift, 12=Howling Abyss)")
-    platform_id = Column(String, nullable=False, doc="Platform where the match was played")
-    queue_id = Column(Integer, nullable=False, index=True, doc="Queue type ID")
-    
+    game_mode: Mapped[str] = mapped_column(String(16), doc="Game mode (e.g., CLASSIC, ARAM)")
+    game_type: Mapped[str] = mapped_column(String(32), doc="Game type (e.g., MATCHED_GAME)")
+    game_version: Mapped[str] = mapped_column(String(32), doc="Game client version")
+    map_id: Mapped[int] = mapped_column(SmallInteger, doc="Map ID (11=Summoner's Rift, 12=Howling Abyss)")
+    platform_id: Mapped[str] = mapped_column(String(8), doc="Platform where the match was played")
+    queue_id: Mapped[int] = mapped_column(Integer, index=True, doc="Queue type ID")
+
     # Tournament information (if applicable)
-    tournament_code = Column(String, nullable=True, doc="Tournament code if tournament match")
-    
+    tournament_code: Mapped[Optional[str]] = mapped_column(String(64), doc="Tournament code if tournament match")
+
     # Teams and outcome
-    winning_team = Column(Integer, nullable=True, doc="Winning team ID (100 or 200)")
-    
-    # Raw data storage for complex nested data
-    teams_data = Column(JSON, nullable=True, doc="Complete teams data from Riot API")
-    timeline_data = Column(JSON, nullable=True, doc="Match timeline data (if fetched)")
-    
+    winning_team: Mapped[Optional[int]] = mapped_column(SmallInteger, doc="Winning team ID (100 or 200)")
+
+    # Raw data storage for complex nested data. Deferred: no read path uses
+    # these blobs, so loading a Match shouldn't fetch and re-parse them;
+    # opt in with undefer() where they're actually needed
+    teams_data: Mapped[Optional[list]] = mapped_column(JSON, deferred=True, doc="Complete teams data from Riot API")
+    timeline_data: Mapped[Optional[dict]] = mapped_column(JSON, deferred=True, doc="Match timeline data (if fetched)")
+
     # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), doc="When added to database")
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last update")
-    
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), doc="When added to database")
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last update")
+
     # Relationships
-    participants = relationship("MatchParticipant", back_populates="match", lazy="select")
-    
+    participants: Mapped[List["MatchParticipant"]] = relationship("MatchParticipant", back_populates="match", lazy="select")
+
     def __repr__(self):
         return f"<Match(match_id='{self.match_id}', queue_id={self.queue_id}, duration={self.game_duration}s)>"
-    
-    @property
-    def duration_minutes(self) -> float:
-        """Game duration in minutes"""
-        return round(self.game_duration / 60, 1)
-    
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
         return {
             "match_id": self.match_id,
-            "game_creation": self.game_creation.isoformat() if self.game_creation else None,
+            "game_creation": self.game_creation,  # orjson serializes datetime natively
             "game_duration": self.game_duration,
             "duration_minutes": self.duration_minutes,
             "game_mode": self.game_mode,
@@ -63,105 +79,158 @@ class Match(Base):
             "map_id": self.map_id,
             "queue_id": self.queue_id,
             "winning_team": self.winning_team,
-            "created_at": self.created_at.isoformat() if self.created_at else None
+            "created_at": self.created_at
         }
 
 
 class MatchParticipant(Base):
     """Match participant model - stores individual player performance in a match"""
     __tablename__ = "match_participants"
+    __table_args__ = (
+        # puuid leads the key and the table is WITHOUT ROWID, so a player's
+        # rows are stored physically contiguous in the primary B-tree -
+        # every analytics query filters WHERE puuid = ?, and this turns
+        # those scans into a sequential read of a few neighbouring pages
+        # (the SQLite stand-in for hash-partitioning the table by puuid)
+        PrimaryKeyConstraint("puuid", "match_id"),
+        # Per-match participant loads filter by match_id alone, which no
+        # longer prefixes the primary key
+        Index("ix_mp_match_id", "match_id"),
+        # Role analytics filter by puuid first, then team_position
+        Index("ix_match_participants_puuid_team_position", "puuid", "team_position"),
+        # Leaderboard-style queries order a player's rows by derived KDA
+        Index("ix_match_participants_puuid_kda_ratio", "puuid", "kda_ratio"),
+        # Champion aggregates group a player's rows by champion; the
+        # composite avoids re-sorting after the puuid range scan
+        Index("ix_mp_puuid_champion", "puuid", "champion_id"),
+        # Item-build popularity queries group by champion then first item
+        Index("ix_mp_champion_item0", "champion_id", "item0"),
+        {"sqlite_with_rowid": False},
+    )
+
+    # Composite primary key (declared above so puuid leads the key)
+    match_id: Mapped[str] = mapped_column(String(32), ForeignKey("matches.match_id"), doc="Reference to match")
+    puuid: Mapped[str] = mapped_column(String(78), ForeignKey("summoners.puuid"), doc="Player PUUID")
 
-    # Composite primary key
-    match_id = Column(String, ForeignKey("matches.match_id"), primary_key=True, doc="Reference to match")
-    puuid = Column(String, ForeignKey("summoners.puuid"), primary_key=True, index=True, doc="Player PUUID")
-    
     # Participant metadata
-    participant_id = Column(Integer, nullable=False, doc="Participant ID within the match (1-10)")
-    team_id = Column(Integer, nullable=False, doc="Team ID (100 or 200)")
-    
+    participant_id: Mapped[int] = mapped_column(SmallInteger, doc="Participant ID within the match (1-10)")
+    team_id: Mapped[int] = mapped_column(SmallInteger, doc="Team ID (100 or 200)")
+
     # Champion and summoner spells
-    champion_id = Column(Integer, nullable=False, index=True, doc="Champion ID")
-    champion_name = Column(String, nullable=False, doc="Champion name")
-    champion_level = Column(Integer, nullable=False, doc="Champion level achieved")
-    summoner_spell_1 = Column(Integer, nullable=False, doc="First summoner spell ID")
-    summoner_spell_2 = Column(Integer, nullable=False, doc="Second summoner spell ID")
-    
+    champion_id: Mapped[int] = mapped_column(Integer, index=True, doc="Champion ID")
+    champion_name: Mapped[str] = mapped_column(String(32), doc="Champion name")
+    champion_level: Mapped[int] = mapped_column(SmallInteger, doc="Champion level achieved")
+    summoner_spell_1: Mapped[int] = mapped_column(Integer, doc="First summoner spell ID")
+    summoner_spell_2: Mapped[int] = mapped_column(Integer, doc="Second summoner spell ID")
+
     # Position/Role data
-    team_position = Column(String, nullable=True, index=True, doc="Team position (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)")
-    individual_position = Column(String, nullable=True, doc="Individual position (may differ from team position)")
-    role = Column(String, nullable=True, doc="Role (DUO_CARRY, DUO_SUPPORT, etc.)")
-    lane = Column(String, nullable=True, doc="Lane (TOP, JUNGLE, MID, BOT)")
-    
+    team_position: Mapped[Optional[str]] = mapped_column(String(16), doc="Team position (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)")
+    individual_position: Mapped[Optional[str]] = mapped_column(String(16), doc="Individual position (may differ from team position)")
+    role: Mapped[Optional[str]] = mapped_column(String(16), doc="Role (DUO_CARRY, DUO_SUPPORT, etc.)")
+    lane: Mapped[Optional[str]] = mapped_column(String(16), doc="Lane (TOP, JUNGLE, MID, BOT)")
+
     # KDA and combat stats
-    kills = Column(Integer, nullable=False, default=0, doc="Kills")
-    deaths = Column(Integer, nullable=False, default=0, doc="Deaths") 
-    assists = Column(Integer, nullable=False, default=0, doc="Assists")
-    double_kills = Column(Integer, nullable=False, default=0, doc="Double kills")
-    triple_kills = Column(Integer, nullable=False, default=0, doc="Triple kills")
-    quadra_kills = Column(Integer, nullable=False, default=0, doc="Quadra kills")
-    penta_kills = Column(Integer, nullable=False, default=0, doc="Penta kills")
-    
+    kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Kills")
+    deaths: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Deaths")
+    assists: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Assists")
+    double_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Double kills")
+    triple_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Triple kills")
+    quadra_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Quadra kills")
+    penta_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Penta kills")
+
     # Damage stats
-    total_damage_dealt = Column(Integer, nullable=False, default=0, doc="Total damage dealt")
-    total_damage_dealt_to_champions = Column(Integer, nullable=False, default=0, doc="Damage to champions")
-    total_damage_taken = Column(Integer, nullable=False, default=0, doc="Total damage taken")
-    magic_damage_dealt = Column(Integer, nullable=False, default=0, doc="Magic damage dealt")
-    physical_damage_dealt = Column(Integer, nullable=False, default=0, doc="Physical damage dealt")
-    true_damage_dealt = Column(Integer, nullable=False, default=0, doc="True damage dealt")
-    
+    total_damage_dealt: Mapped[int] = mapped_column(Integer, default=0, doc="Total damage dealt")
+    total_damage_dealt_to_champions: Mapped[int] = mapped_column(Integer, default=0, doc="Damage to champions")
+    total_damage_taken: Mapped[int] = mapped_column(Integer, default=0, doc="Total damage taken")
+    magic_damage_dealt: Mapped[int] = mapped_column(Integer, default=0, doc="Magic damage dealt")
+    physical_damage_dealt: Mapped[int] = mapped_column(Integer, default=0, doc="Physical damage dealt")
+    true_damage_dealt: Mapped[int] = mapped_column(Integer, default=0, doc="True damage dealt")
+
     # Gold and CS
-    gold_earned = Column(Integer, nullable=False, default=0, doc="Total gold earned")
-    total_minions_killed = Column(Integer, nullable=False, default=0, doc="CS (creep score)")
-    neutral_minions_killed = Column(Integer, nullable=False, default=0, doc="Jungle monsters killed")
-    
+    gold_earned: Mapped[int] = mapped_column(Integer, default=0, doc="Total gold earned")
+    total_minions_killed: Mapped[int] = mapped_column(Integer, default=0, doc="CS (creep score)")
+    neutral_minions_killed: Mapped[int] = mapped_column(Integer, default=0, doc="Jungle monsters killed")
+
     # Vision and objectives
-    vision_score = Column(Integer, nullable=False, default=0, doc="Vision score")
-    wards_placed = Column(Integer, nullable=False, default=0, doc="Wards placed")
-    wards_killed = Column(Integer, nullable=False, default=0, doc="Enemy wards destroyed")
-    control_wards_purchased = Column(Integer, nullable=False, default=0, doc="Control wards bought")
-    
+    vision_score: Mapped[int] = mapped_column(Integer, default=0, doc="Vision score")
+    wards_placed: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Wards placed")
+    wards_killed: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Enemy wards destroyed")
+    control_wards_purchased: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Control wards bought")
+
     # Objectives participation
-    turret_kills = Column(Integer, nullable=False, default=0, doc="Turrets destroyed")
-    inhibitor_kills = Column(Integer, nullable=False, default=0, doc="Inhibitors destroyed")
-    dragon_kills = Column(Integer, nullable=False, default=0, doc="Dragons killed")
-    baron_kills = Column(Integer, nullable=False, default=0, doc="Barons killed")
-    
+    turret_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Turrets destroyed")
+    inhibitor_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Inhibitors destroyed")
+    dragon_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Dragons killed")
+    baron_kills: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Barons killed")
+
     # Performance metrics
-    largest_killing_spree = Column(Integer, nullable=False, default=0, doc="Largest killing spree")
-    largest_multi_kill = Column(Integer, nullable=False, default=0, doc="Largest multi-kill")
-    total_time_cc_dealt = Column(Integer, nullable=False, default=0, doc="Total crowd control time")
-    
+    largest_killing_spree: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Largest killing spree")
+    largest_multi_kill: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Largest multi-kill")
+    total_time_cc_dealt: Mapped[int] = mapped_column(Integer, default=0, doc="Total crowd control time")
+
     # Match outcome
-    win = Column(Boolean, nullable=False, doc="Whether the player won")
-    
-    # Items (store as JSON for flexibility)
-    items = Column(JSON, nullable=True, doc="Final item build")
-    
-    # Raw participant data for future analysis
-    raw_data = Column(JSON, nullable=True, doc="Complete participant data from Riot API")
-    
+    win: Mapped[bool] = mapped_column(Boolean, doc="Whether the player won")
+
+    # Denormalized from Match so the per-minute rate below needs no join
+    game_duration_seconds: Mapped[Optional[int]] = mapped_column(Integer, doc="Match duration in seconds (copied from Match)")
+
+    # Derived stats, computed by SQLite instead of Python so they can feed
+    # SQL aggregates and indexes directly (SQLite only allows adding VIRTUAL
+    # generated columns via ALTER TABLE)
+    kda_ratio: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed(
+            "CASE WHEN deaths = 0 THEN CAST(kills + assists AS REAL) "
+            "ELSE round(CAST(kills + assists AS REAL) / deaths, 2) END"
+        ),
+        doc="KDA ratio: (kills + assists) / deaths",
+    )
+    cs_per_minute: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed(
+            "CASE WHEN game_duration_seconds > 0 "
+            "THEN round(total_minions_killed * 60.0 / game_duration_seconds, 1) "
+            "ELSE 0.0 END"
+        ),
+        doc="CS per minute of game time",
+    )
+
+    # Final item build, one small column per slot instead of a JSON blob:
+    # reading a row needs no JSON parse and build-popularity queries can
+    # GROUP BY the columns directly
+    item0: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 0")
+    item1: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 1")
+    item2: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 2")
+    item3: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 3")
+    item4: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 4")
+    item5: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Item slot 5")
+    trinket: Mapped[int] = mapped_column(SmallInteger, default=0, doc="Trinket slot (item6)")
+
+    # Raw participant data for future analysis. Deferred for the same
+    # reason as the Match blobs: it's the widest column on a row that
+    # analytics scans in bulk, and nothing reads it back yet
+    raw_data: Mapped[Optional[dict]] = mapped_column(JSON, deferred=True, doc="Complete participant data from Riot API")
+
     # Relationships
-    match = relationship("Match", back_populates="participants")
-    summoner = relationship("Summoner", back_populates="match_participants")
-    
+    match: Mapped["Match"] = relationship("Match", back_populates="participants")
+    summoner: Mapped["Summoner"] = relationship("Summoner", back_populates="match_participants")
+
     def __repr__(self):
         return f"<MatchParticipant(match_id='{self.match_id}', puuid='{self.puuid[:8]}...', champion='{self.champion_name}')>"
-    
-    @property
-    def kda_ratio(self) -> float:
-        """Calculate KDA ratio: (kills + assists) / deaths"""
-        if self.deaths == 0:
-            return float(self.kills + self.assists)
-        return round((self.kills + self.assists) / self.deaths, 2)
-    
+
     @property
-    def cs_per_minute(self) -> float:
-        """Calculate CS per minute"""
-        if hasattr(self, 'match') and self.match and self.match.game_duration > 0:
-            minutes = self.match.game_duration / 60
-            return round(self.total_minions_killed / minutes, 1)
-        return 0.0
-    
+    def items(self) -> dict:
+        """Item build in the legacy JSON shape the API responses expose"""
+        return {
+            "item0": self.item0,
+            "item1": self.item1,
+            "item2": self.item2,
+            "item3": self.item3,
+            "item4": self.item4,
+            "item5": self.item5,
+            "item6": self.trinket,
+        }
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
         return {
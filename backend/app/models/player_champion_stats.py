@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, Date, DateTime, Float
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PlayerChampionStats(Base):
+    """
+    Pre-aggregated per-player per-champion per-day match statistics.
+
+    Companion table to PlayerDailyStats: champion performance endpoints read
+    a handful of small indexed rows per champion instead of re-scanning and
+    re-grouping match_participants + matches on every request. The day
+    column keeps the endpoints' `days` window filter exact. Refreshed per
+    player after match ingest via
+    AnalyticsService.refresh_player_champion_stats.
+    """
+    __tablename__ = "player_champion_stats"
+
+    # Composite primary key - one row per player per champion per day
+    puuid: Mapped[str] = mapped_column(String(78), primary_key=True, doc="Player PUUID")
+    champion_id: Mapped[int] = mapped_column(Integer, primary_key=True, doc="Champion ID")
+    day: Mapped[date] = mapped_column(Date, primary_key=True, doc="Calendar day of the matches")
+
+    champion_name: Mapped[str] = mapped_column(String(32), doc="Champion name")
+
+    # Counts
+    games: Mapped[int] = mapped_column(Integer, default=0, doc="Matches played")
+    wins: Mapped[int] = mapped_column(Integer, default=0, doc="Matches won")
+
+    # Sums of per-match values; averages are sum / count so aggregates over
+    # multiple days reproduce the per-match averages exactly
+    kills_sum: Mapped[int] = mapped_column(Integer, default=0, doc="Sum of kills")
+    deaths_sum: Mapped[int] = mapped_column(Integer, default=0, doc="Sum of deaths")
+    assists_sum: Mapped[int] = mapped_column(Integer, default=0, doc="Sum of assists")
+    cs_per_min_sum: Mapped[float] = mapped_column(Float, default=0.0, doc="Sum of per-match CS/min values")
+    cs_games: Mapped[int] = mapped_column(Integer, default=0, doc="Matches with a valid duration for CS/min")
+    damage_sum: Mapped[float] = mapped_column(Float, default=0.0, doc="Sum of damage to champions")
+    vision_sum: Mapped[float] = mapped_column(Float, default=0.0, doc="Sum of vision scores")
+
+    # Most recent match with the champion that day
+    last_played: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), doc="Newest game_creation in the bucket")
+
+    # Metadata
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last refresh")
+
+    def __repr__(self):
+        return f"<PlayerChampionStats(puuid='{self.puuid[:8]}...', champion='{self.champion_name}', day={self.day}, games={self.games})>"
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, Date, DateTime, Float
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PlayerDailyStats(Base):
+    """
+    Pre-aggregated per-player per-day match statistics.
+
+    Serves the same purpose as a materialized view: analytics endpoints that
+    need daily aggregates read one small indexed row per day instead of
+    re-scanning match_participants. Refreshed per player after match ingest
+    via AnalyticsService.refresh_player_daily_stats.
+    """
+    __tablename__ = "player_daily_stats"
+
+    # Composite primary key - one row per player per day
+    puuid: Mapped[str] = mapped_column(String(78), primary_key=True, doc="Player PUUID")
+    day: Mapped[date] = mapped_column(Date, primary_key=True, doc="Calendar day of the matches")
+
+    # Counts
+    games: Mapped[int] = mapped_column(Integer, default=0, doc="Matches played that day")
+    wins: Mapped[int] = mapped_column(Integer, default=0, doc="Matches won that day")
+
+    # Sums of per-match values; averages are sum / count so aggregates over
+    # multiple days reproduce the per-match averages exactly
+    kda_sum: Mapped[float] = mapped_column(Float, default=0.0, doc="Sum of per-match KDA ratios")
+    cs_per_min_sum: Mapped[float] = mapped_column(Float, default=0.0, doc="Sum of per-match CS/min values")
+    cs_games: Mapped[int] = mapped_column(Integer, default=0, doc="Matches with a valid duration for CS/min")
+
+    # Metadata
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last refresh")
+
+    def __repr__(self):
+        return f"<PlayerDailyStats(puuid='{self.puuid[:8]}...', day={self.day}, games={self.games})>"
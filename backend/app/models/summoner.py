@@ -1,48 +1,69 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import String, Integer, DateTime, Boolean, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    # Only for the relationship annotations below; the mapper resolves the
+    # string references from its registry, so no runtime import is needed
+    from app.models.champion_mastery import ChampionMastery
+    from app.models.match import MatchParticipant
+
 
 class Summoner(Base):
     """Summoner model - stores League of Legends summoner information"""
     __tablename__ = "summoners"
+    __table_args__ = (
+        # Riot ID lookups filter on both columns together
+        Index("ix_summoners_game_name_tag_line", "game_name", "tag_line"),
+    )
 
     # Primary identifier
-    puuid = Column(String, primary_key=True, index=True, doc="Player Universally Unique Identifier")
-    
+    puuid: Mapped[str] = mapped_column(String(78), primary_key=True, index=True, doc="Player Universally Unique Identifier")
+
     # Riot ID components (new system)
-    game_name = Column(String, nullable=False, index=True, doc="Riot ID game name (before #)")
-    tag_line = Column(String, nullable=False, doc="Riot ID tag line (after #)")
-    
+    game_name: Mapped[str] = mapped_column(String(32), index=True, doc="Riot ID game name (before #)")
+    tag_line: Mapped[str] = mapped_column(String(8), doc="Riot ID tag line (after #)")
+
     # Summoner profile data
-    summoner_id = Column(String, nullable=True, index=True, doc="Summoner ID for region-specific endpoints")
-    account_id = Column(String, nullable=True, doc="Account ID (legacy)")
-    summoner_level = Column(Integer, nullable=False, doc="Current summoner level")
-    profile_icon_id = Column(Integer, nullable=True, doc="Profile icon ID")
-    revision_date = Column(Integer, nullable=False, doc="Last revision timestamp from Riot")
-    
+    summoner_id: Mapped[Optional[str]] = mapped_column(String(63), index=True, doc="Summoner ID for region-specific endpoints")
+    account_id: Mapped[Optional[str]] = mapped_column(String(56), doc="Account ID (legacy)")
+    summoner_level: Mapped[int] = mapped_column(Integer, doc="Current summoner level")
+    profile_icon_id: Mapped[Optional[int]] = mapped_column(Integer, doc="Profile icon ID")
+    revision_date: Mapped[int] = mapped_column(Integer, doc="Last revision timestamp from Riot")
+
     # Regional information
-    region = Column(String, nullable=False, doc="League region (e.g., na1, euw1)")
-    
+    region: Mapped[str] = mapped_column(String(8), doc="League region (e.g., na1, euw1)")
+
     # Metadata
-    first_seen = Column(DateTime(timezone=True), server_default=func.now(), doc="When first added to database")
-    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last data update")
-    is_active = Column(Boolean, default=True, doc="Whether summoner is actively tracked")
-    
-    # Relationships
-    match_participants = relationship("MatchParticipant", back_populates="summoner", lazy="dynamic")
-    champion_masteries = relationship("ChampionMastery", back_populates="summoner", lazy="dynamic")
-    
+    first_seen: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), doc="When first added to database")
+    last_updated: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), doc="Last data update")
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True, doc="Whether summoner is actively tracked")
+
+    # Relationships. Nothing traverses these from a loaded Summoner (the
+    # participant/mastery services query by puuid directly), so lazy="raise"
+    # turns an accidental traversal into an explicit error instead of a
+    # hidden per-access SELECT; opt in with selectinload() where needed
+    match_participants: Mapped[List["MatchParticipant"]] = relationship("MatchParticipant", back_populates="summoner", lazy="raise")
+    champion_masteries: Mapped[List["ChampionMastery"]] = relationship("ChampionMastery", back_populates="summoner", lazy="raise")
+
     def __repr__(self):
         return f"<Summoner(puuid='{self.puuid}', game_name='{self.game_name}#{self.tag_line}', level={self.summoner_level})>"
-    
-    @property
+
+    @cached_property
     def riot_id(self) -> str:
-        """Full Riot ID in format: gameName#tagLine"""
+        """Full Riot ID in format: gameName#tagLine
+
+        Memoized per instance; the components never change mid-request, and
+        response assembly reads this repeatedly in per-row loops.
+        """
         return f"{self.game_name}#{self.tag_line}"
-    
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
         return {
@@ -53,5 +74,5 @@ class Summoner(Base):
             "summoner_level": self.summoner_level,
             "profile_icon_id": self.profile_icon_id,
             "region": self.region,
-            "last_updated": self.last_updated.isoformat() if self.last_updated else None
+            "last_updated": self.last_updated  # orjson serializes datetime natively
         }
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 
@@ -18,8 +18,7 @@ class PlayerOverviewStats(BaseModel):
     total_playtime_hours: float = Field(..., description="Total playtime in hours")
     timeframe_days: int = Field(..., description="Timeframe in days")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChampionPerformance(BaseModel):
@@ -39,8 +38,7 @@ class ChampionPerformance(BaseModel):
     avg_vision_score: float = Field(..., description="Average vision score")
     last_played: datetime = Field(..., description="Last time this champion was played")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PerformanceTrendData(BaseModel):
@@ -52,8 +50,7 @@ class PerformanceTrendData(BaseModel):
     avg_kda: float = Field(..., description="Average KDA for this date")
     avg_cs_per_min: float = Field(..., description="Average CS per minute for this date")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PerformanceTrends(BaseModel):
@@ -63,8 +60,7 @@ class PerformanceTrends(BaseModel):
     kda_trend: str = Field(..., description="KDA trend (improving/declining/stable/insufficient_data)")
     cs_trend: str = Field(..., description="CS trend (improving/declining/stable/insufficient_data)")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GPIMetrics(BaseModel):
@@ -76,8 +72,7 @@ class GPIMetrics(BaseModel):
     versatility: float = Field(..., ge=0, le=10, description="Versatility score (champion pool diversity)")
     consistency: float = Field(..., ge=0, le=10, description="Consistency score (win rate and performance variance)")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class RecentMatchPerformance(BaseModel):
@@ -102,8 +97,7 @@ class RecentMatchPerformance(BaseModel):
     queue_id: int = Field(..., description="Queue type ID")
     game_mode: str = Field(..., description="Game mode")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AnalyticsRequest(BaseModel):
@@ -122,8 +116,7 @@ class ComprehensiveAnalytics(BaseModel):
     recent_matches: List[RecentMatchPerformance] = Field(..., description="Recent match performance")
     generated_at: datetime = Field(..., description="When this analysis was generated")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InsightData(BaseModel):
@@ -134,8 +127,7 @@ class InsightData(BaseModel):
     metric_value: Optional[float] = Field(None, description="Associated metric value")
     priority: str = Field(..., description="Priority level (high/medium/low)")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PerformanceInsights(BaseModel):
@@ -147,5 +139,4 @@ class PerformanceInsights(BaseModel):
     primary_weakness: str = Field(..., description="Primary area for improvement")
     generated_at: datetime = Field(..., description="When insights were generated")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
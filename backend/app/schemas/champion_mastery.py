@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import ConfigDict, BaseModel
 from typing import Optional, List
 from datetime import datetime
 
@@ -11,12 +11,11 @@ class ChampionMasteryResponse(BaseModel):
     points_until_next_level: Optional[int] = None
     chest_granted: bool = False
     tokens_earned: int = 0
-    last_play_time: Optional[str] = None  # ISO format datetime string
+    last_play_time: Optional[datetime] = None  # orjson emits RFC3339
     mastery_progress_percentage: float
-    updated_at: Optional[str] = None  # ISO format datetime string
+    updated_at: Optional[datetime] = None  # orjson emits RFC3339
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChampionMasteryListResponse(BaseModel):
@@ -45,7 +44,7 @@ class ChampionMasteryWithPerformance(BaseModel):
     points_until_next_level: Optional[int] = None
     chest_granted: bool = False
     tokens_earned: int = 0
-    last_play_time: Optional[str] = None
+    last_play_time: Optional[datetime] = None
     mastery_progress_percentage: float
     
     # Performance data from matches
@@ -55,7 +54,7 @@ class ChampionMasteryWithPerformance(BaseModel):
     win_rate: Optional[float] = None
     avg_kda: Optional[float] = None
     avg_cs_per_min: Optional[float] = None
-    last_played_match: Optional[str] = None  # ISO format datetime string
+    last_played_match: Optional[datetime] = None
 
 
 class ChampionMasteryEnhancedResponse(BaseModel):
@@ -1,8 +1,28 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import ConfigDict, BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
 
+class MonitorParams(BaseModel):
+    """Query parameters for monitoring multiple players' live games
+
+    Validation runs before the endpoint body, so bad input short-circuits
+    to a 422 without entering the handler.
+    """
+    puuids: List[str] = Field(..., min_length=1, max_length=10, description="PUUIDs to monitor (comma-separated)")
+    region: str = Field("na1", description="Region for API calls")
+
+    @field_validator("puuids", mode="before")
+    @classmethod
+    def split_comma_separated(cls, value):
+        """Accept both repeated params and a single comma-separated string"""
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            return [p.strip() for chunk in value for p in str(chunk).split(",") if p.strip()]
+        return value
+
+
 class LiveGameParticipantResponse(BaseModel):
     """Response schema for live game participant"""
     summoner_name: str
@@ -13,8 +33,7 @@ class LiveGameParticipantResponse(BaseModel):
     team_id: int
     perks: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TeamCompositionResponse(BaseModel):
@@ -87,10 +106,17 @@ class LiveGameStatusResponse(BaseModel):
     recommendations: Optional[GameRecommendations] = None
 
 
+class MonitorPlayerError(BaseModel):
+    """Per-player failure entry in a monitor response"""
+    error: str
+
+
 class LiveGameMonitorResponse(BaseModel):
     """Response for monitoring multiple players"""
     success: bool
-    data: Dict[str, Any]  # PUUID -> LiveGameStatusResponse
+    # Players whose check failed get an {"error": ...} entry instead of a
+    # status, so the value type is a union of the two shapes
+    data: Dict[str, Union[LiveGameStatusResponse, MonitorPlayerError]]
     region: str
     monitored_count: int
 
@@ -185,8 +211,20 @@ class LiveGameAPIResponse(BaseModel):
     message: Optional[str] = None
     region: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SummonerInfo(BaseModel):
+    """Summoner identity block attached to live game responses"""
+    puuid: str
+    game_name: Optional[str] = None
+    tag_line: Optional[str] = None
+    riot_id: Optional[str] = None
+    summoner_level: Optional[int] = None
+    profile_icon_id: Optional[int] = None
+    region: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SummonerLiveGameResponse(BaseModel):
@@ -194,4 +232,4 @@ class SummonerLiveGameResponse(BaseModel):
     success: bool
     data: LiveGameStatusResponse
     region: str
-    summoner: Dict[str, Any]  # Summoner info
+    summoner: SummonerInfo
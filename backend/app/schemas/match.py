@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -32,8 +32,7 @@ class MatchParticipantResponse(BaseModel):
     # Items
     items: Optional[Dict[str, int]] = Field(None, description="Item build")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MatchResponse(BaseModel):
@@ -55,8 +54,7 @@ class MatchResponse(BaseModel):
     # Participants (optional, can be loaded separately)
     participants: Optional[List[MatchParticipantResponse]] = Field(None, description="Match participants")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MatchHistoryRequest(BaseModel):
@@ -95,5 +93,4 @@ class PlayerMatchPerformance(BaseModel):
     game_duration_minutes: float = Field(..., description="Game duration in minutes")
     game_creation: datetime = Field(..., description="When the match was played")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, BaseModel, Field
 from typing import Optional
 
 
@@ -24,5 +24,4 @@ class SummonerResponse(BaseModel):
     revision_date: int = Field(..., description="Revision date")
     region: str = Field(..., description="League region")
     
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
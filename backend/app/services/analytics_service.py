@@ -1,18 +1,179 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, extract
+from sqlalchemy import select, func, and_, case, extract, delete, insert
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict, Counter
 import statistics
 
 from app.models.match import Match, MatchParticipant
+from app.models.player_daily_stats import PlayerDailyStats
+from app.models.player_champion_stats import PlayerChampionStats
 from .cache_service import cache_analytics, cache_match_data
 from app.models.summoner import Summoner
 
 
 class AnalyticsService:
     """Service for calculating performance analytics from match data"""
-    
+
+    @staticmethod
+    async def get_latest_match_time(
+        db: AsyncSession,
+        puuid: str
+    ) -> Optional[datetime]:
+        """Get the newest stored match time for a player, used as a data version for ETags"""
+        result = await db.execute(
+            select(func.max(Match.game_creation))
+            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+            .where(MatchParticipant.puuid == puuid)
+        )
+        return result.scalar()
+
+    @staticmethod
+    async def refresh_player_daily_stats(
+        db: AsyncSession,
+        puuid: str
+    ) -> int:
+        """
+        Rebuild the pre-aggregated daily stats for a player.
+
+        Works like a scoped materialized-view refresh: one GROUP BY over the
+        player's match history replaces their player_daily_stats rows, so
+        analytics reads afterwards touch only the small aggregate table.
+        Called after match ingest.
+
+        Args:
+            db: Database session
+            puuid: Player PUUID
+
+        Returns:
+            Number of daily rows written
+        """
+        # Branchless KDA: max(deaths, 1) gives the identical result when
+        # deaths == 0 (numerator / 1) without a per-row CASE
+        kda_expr = (
+            (MatchParticipant.kills + MatchParticipant.assists) * 1.0
+            / func.max(MatchParticipant.deaths, 1)
+        )
+        cs_per_min_expr = case(
+            (Match.game_duration > 0,
+             MatchParticipant.total_minions_killed / (Match.game_duration / 60.0))
+        )
+        day_expr = func.date(Match.game_creation)
+
+        result = await db.execute(
+            select(
+                day_expr.label("day"),
+                func.count().label("games"),
+                func.sum(case((MatchParticipant.win, 1), else_=0)).label("wins"),
+                func.sum(kda_expr).label("kda_sum"),
+                func.coalesce(func.sum(cs_per_min_expr), 0.0).label("cs_per_min_sum"),
+                func.sum(case((Match.game_duration > 0, 1), else_=0)).label("cs_games"),
+            )
+            .select_from(MatchParticipant)
+            .join(Match, Match.match_id == MatchParticipant.match_id)
+            .where(MatchParticipant.puuid == puuid)
+            .group_by(day_expr)
+        )
+        rows = result.all()
+
+        # Full per-player rebuild keeps the refresh idempotent
+        await db.execute(delete(PlayerDailyStats).where(PlayerDailyStats.puuid == puuid))
+        if rows:
+            await db.execute(
+                insert(PlayerDailyStats),
+                [
+                    {
+                        "puuid": puuid,
+                        "day": date.fromisoformat(row.day),
+                        "games": row.games,
+                        "wins": row.wins,
+                        "kda_sum": row.kda_sum,
+                        "cs_per_min_sum": row.cs_per_min_sum,
+                        "cs_games": row.cs_games,
+                    }
+                    for row in rows
+                ]
+            )
+        await db.commit()
+        return len(rows)
+
+    @staticmethod
+    async def refresh_player_champion_stats(
+        db: AsyncSession,
+        puuid: str
+    ) -> int:
+        """
+        Rebuild the pre-aggregated per-champion stats for a player.
+
+        Same scoped materialized-view pattern as
+        refresh_player_daily_stats: one GROUP BY over the player's match
+        history replaces their player_champion_stats rows. Called after
+        match ingest.
+
+        Args:
+            db: Database session
+            puuid: Player PUUID
+
+        Returns:
+            Number of aggregate rows written
+        """
+        cs_per_min_expr = case(
+            (Match.game_duration > 0,
+             MatchParticipant.total_minions_killed / (Match.game_duration / 60.0))
+        )
+        day_expr = func.date(Match.game_creation)
+
+        result = await db.execute(
+            select(
+                MatchParticipant.champion_id,
+                func.max(MatchParticipant.champion_name).label("champion_name"),
+                day_expr.label("day"),
+                func.count().label("games"),
+                func.sum(case((MatchParticipant.win, 1), else_=0)).label("wins"),
+                func.sum(MatchParticipant.kills).label("kills_sum"),
+                func.sum(MatchParticipant.deaths).label("deaths_sum"),
+                func.sum(MatchParticipant.assists).label("assists_sum"),
+                func.coalesce(func.sum(cs_per_min_expr), 0.0).label("cs_per_min_sum"),
+                func.sum(case((Match.game_duration > 0, 1), else_=0)).label("cs_games"),
+                func.sum(MatchParticipant.total_damage_dealt_to_champions).label("damage_sum"),
+                func.sum(MatchParticipant.vision_score).label("vision_sum"),
+                func.max(Match.game_creation).label("last_played"),
+            )
+            .select_from(MatchParticipant)
+            .join(Match, Match.match_id == MatchParticipant.match_id)
+            .where(MatchParticipant.puuid == puuid)
+            .group_by(MatchParticipant.champion_id, day_expr)
+        )
+        rows = result.all()
+
+        # Full per-player rebuild keeps the refresh idempotent
+        await db.execute(delete(PlayerChampionStats).where(PlayerChampionStats.puuid == puuid))
+        if rows:
+            await db.execute(
+                insert(PlayerChampionStats),
+                [
+                    {
+                        "puuid": puuid,
+                        "champion_id": row.champion_id,
+                        "champion_name": row.champion_name,
+                        "day": date.fromisoformat(row.day),
+                        "games": row.games,
+                        "wins": row.wins,
+                        "kills_sum": row.kills_sum,
+                        "deaths_sum": row.deaths_sum,
+                        "assists_sum": row.assists_sum,
+                        "cs_per_min_sum": row.cs_per_min_sum,
+                        "cs_games": row.cs_games,
+                        "damage_sum": row.damage_sum,
+                        "vision_sum": row.vision_sum,
+                        "last_played": row.last_played,
+                    }
+                    for row in rows
+                ]
+            )
+        await db.commit()
+        return len(rows)
+
     @staticmethod
     @cache_analytics(ttl_seconds=600)  # Cache for 10 minutes
     async def get_player_overview_stats(
@@ -33,23 +194,37 @@ class AnalyticsService:
         """
         # Get date threshold
         date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get matches within the timeframe
-        result = await db.execute(
-            select(Match, MatchParticipant)
-            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+
+        # One aggregate query instead of pulling every row into Python;
+        # AVG skips NULLs, so the CASE keeps undated matches out of CS/min
+        row = (await db.execute(
+            select(
+                func.count().label("total_games"),
+                func.sum(case((MatchParticipant.win, 1), else_=0)).label("wins"),
+                func.avg(MatchParticipant.kills).label("avg_kills"),
+                func.avg(MatchParticipant.deaths).label("avg_deaths"),
+                func.avg(MatchParticipant.assists).label("avg_assists"),
+                func.avg(
+                    case(
+                        (Match.game_duration > 0,
+                         MatchParticipant.total_minions_killed / (Match.game_duration / 60.0))
+                    )
+                ).label("avg_cs_per_min"),
+                func.avg(MatchParticipant.vision_score).label("avg_vision_score"),
+                func.sum(case((Match.game_duration > 0, Match.game_duration), else_=0)).label("playtime_seconds"),
+            )
+            .select_from(MatchParticipant)
+            .join(Match, Match.match_id == MatchParticipant.match_id)
             .where(
                 and_(
                     MatchParticipant.puuid == puuid,
                     Match.game_creation >= date_threshold
                 )
             )
-            .order_by(Match.game_creation.desc())
-        )
-        
-        matches_data = result.all()
-        
-        if not matches_data:
+        )).one()
+
+        total_games = row.total_games
+        if not total_games:
             return {
                 "total_games": 0,
                 "wins": 0,
@@ -64,37 +239,17 @@ class AnalyticsService:
                 "total_playtime_hours": 0.0,
                 "timeframe_days": days
             }
-        
-        # Extract data for calculations
-        total_games = len(matches_data)
-        wins = sum(1 for _, participant in matches_data if participant.win)
+
+        wins = row.wins or 0
         losses = total_games - wins
-        
-        # Calculate averages
-        total_kills = sum(participant.kills for _, participant in matches_data)
-        total_deaths = sum(participant.deaths for _, participant in matches_data)
-        total_assists = sum(participant.assists for _, participant in matches_data)
-        
-        # Calculate KDA
-        avg_kills = total_kills / total_games
-        avg_deaths = total_deaths / total_games if total_deaths > 0 else 0
-        avg_assists = total_assists / total_games
-        avg_kda = (avg_kills + avg_assists) / avg_deaths if avg_deaths > 0 else float(avg_kills + avg_assists)
-        
-        # Calculate CS per minute
-        cs_per_min_values = []
-        total_playtime_seconds = 0
-        
-        for match, participant in matches_data:
-            if match.game_duration > 0:
-                cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
-                cs_per_min_values.append(cs_per_min)
-                total_playtime_seconds += match.game_duration
-        
-        avg_cs_per_min = statistics.mean(cs_per_min_values) if cs_per_min_values else 0.0
-        avg_vision_score = statistics.mean([p.vision_score for _, p in matches_data])
-        total_playtime_hours = total_playtime_seconds / 3600
-        
+        avg_kills = row.avg_kills or 0.0
+        avg_deaths = row.avg_deaths or 0.0
+        avg_assists = row.avg_assists or 0.0
+        avg_kda = (avg_kills + avg_assists) / (avg_deaths or 1)
+        avg_cs_per_min = row.avg_cs_per_min or 0.0
+        avg_vision_score = row.avg_vision_score or 0.0
+        total_playtime_hours = (row.playtime_seconds or 0) / 3600
+
         return {
             "total_games": total_games,
             "wins": wins,
@@ -128,77 +283,69 @@ class AnalyticsService:
         Returns:
             List of champion performance dictionaries
         """
-        date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get matches within timeframe
-        result = await db.execute(
-            select(Match, MatchParticipant)
-            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+        date_threshold = (datetime.now() - timedelta(days=days)).date()
+
+        # Roll up the small pre-aggregated per-champion-per-day rows instead
+        # of re-scanning match_participants + matches on every request
+        stats_query = (
+            select(
+                func.max(PlayerChampionStats.champion_name).label("champion_name"),
+                PlayerChampionStats.champion_id,
+                func.sum(PlayerChampionStats.games).label("total_games"),
+                func.sum(PlayerChampionStats.wins).label("wins"),
+                func.sum(PlayerChampionStats.kills_sum).label("kills_sum"),
+                func.sum(PlayerChampionStats.deaths_sum).label("deaths_sum"),
+                func.sum(PlayerChampionStats.assists_sum).label("assists_sum"),
+                func.sum(PlayerChampionStats.cs_per_min_sum).label("cs_per_min_sum"),
+                func.sum(PlayerChampionStats.cs_games).label("cs_games"),
+                func.sum(PlayerChampionStats.damage_sum).label("damage_sum"),
+                func.sum(PlayerChampionStats.vision_sum).label("vision_sum"),
+                func.max(PlayerChampionStats.last_played).label("last_played"),
+            )
             .where(
                 and_(
-                    MatchParticipant.puuid == puuid,
-                    Match.game_creation >= date_threshold
+                    PlayerChampionStats.puuid == puuid,
+                    PlayerChampionStats.day >= date_threshold
                 )
             )
+            .group_by(PlayerChampionStats.champion_id)
+            .order_by(func.sum(PlayerChampionStats.games).desc())
         )
-        
-        matches_data = result.all()
-        
-        # Group by champion
-        champion_stats = defaultdict(list)
-        for match, participant in matches_data:
-            champion_stats[participant.champion_name].append((match, participant))
-        
-        # Calculate stats for each champion
+        rows = (await db.execute(stats_query)).all()
+
+        if not rows:
+            # Player may have been synced before the aggregate table existed -
+            # build their rows once (lazy materialized-view refresh)
+            if await AnalyticsService.refresh_player_champion_stats(db, puuid):
+                rows = (await db.execute(stats_query)).all()
+
         champion_performance = []
-        for champion_name, champion_matches in champion_stats.items():
-            try:
-                total_games = len(champion_matches)
-                wins = sum(1 for _, p in champion_matches if p.win)
-                
-                # Calculate averages
-                avg_kills = statistics.mean([p.kills for _, p in champion_matches])
-                avg_deaths = statistics.mean([p.deaths for _, p in champion_matches])
-                avg_assists = statistics.mean([p.assists for _, p in champion_matches])
-                avg_kda = (avg_kills + avg_assists) / avg_deaths if avg_deaths > 0 else float(avg_kills + avg_assists)
-                
-                # CS per minute
-                cs_per_min_values = []
-                for match, participant in champion_matches:
-                    if match.game_duration and match.game_duration > 0:
-                        cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
-                        cs_per_min_values.append(cs_per_min)
-                
-                avg_cs_per_min = statistics.mean(cs_per_min_values) if cs_per_min_values else 0.0
-                avg_damage = statistics.mean([p.total_damage_dealt_to_champions for _, p in champion_matches])
-                avg_vision = statistics.mean([p.vision_score for _, p in champion_matches])
-                
-                # Handle last_played safely
-                valid_dates = [m.game_creation for m, _ in champion_matches if m.game_creation is not None]
-                last_played = max(valid_dates) if valid_dates else None
-                
-                champion_performance.append({
-                    "champion_name": champion_name,
-                    "champion_id": champion_matches[0][1].champion_id,  # Get from first match
-                    "total_games": total_games,
-                    "wins": wins,
-                    "losses": total_games - wins,
-                    "win_rate": round((wins / total_games) * 100, 1),
-                    "avg_kda": round(avg_kda, 2),
-                    "avg_kills": round(avg_kills, 1),
-                    "avg_deaths": round(avg_deaths, 1),
-                    "avg_assists": round(avg_assists, 1),
-                    "avg_cs_per_min": round(avg_cs_per_min, 1),
-                    "avg_damage_to_champions": round(avg_damage, 0),
-                    "avg_vision_score": round(avg_vision, 1),
-                    "last_played": last_played
-                })
-            except Exception:
-                continue
-        
-        # Sort by total games played (most played first)
-        champion_performance.sort(key=lambda x: x["total_games"], reverse=True)
-        
+        for row in rows:
+            total_games = row.total_games
+            wins = row.wins or 0
+            avg_kills = (row.kills_sum or 0) / total_games
+            avg_deaths = (row.deaths_sum or 0) / total_games
+            avg_assists = (row.assists_sum or 0) / total_games
+            avg_kda = (avg_kills + avg_assists) / (avg_deaths or 1)
+            avg_cs_per_min = (row.cs_per_min_sum / row.cs_games) if row.cs_games else 0.0
+
+            champion_performance.append({
+                "champion_name": row.champion_name,
+                "champion_id": row.champion_id,
+                "total_games": total_games,
+                "wins": wins,
+                "losses": total_games - wins,
+                "win_rate": round((wins / total_games) * 100, 1),
+                "avg_kda": round(avg_kda, 2),
+                "avg_kills": round(avg_kills, 1),
+                "avg_deaths": round(avg_deaths, 1),
+                "avg_assists": round(avg_assists, 1),
+                "avg_cs_per_min": round(avg_cs_per_min, 1),
+                "avg_damage_to_champions": round((row.damage_sum or 0.0) / total_games, 0),
+                "avg_vision_score": round((row.vision_sum or 0.0) / total_games, 1),
+                "last_played": row.last_played
+            })
+
         return champion_performance
     
     @staticmethod
@@ -218,75 +365,59 @@ class AnalyticsService:
         Returns:
             Dictionary containing trend data
         """
-        date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get matches ordered by date
-        result = await db.execute(
-            select(Match, MatchParticipant)
-            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+        date_threshold = (datetime.now() - timedelta(days=days)).date()
+
+        # Read from the pre-aggregated daily table instead of re-scanning
+        # match_participants; one small indexed row per day of activity.
+        # Plain column tuples - nothing here needs ORM instances
+        daily_query = (
+            select(
+                PlayerDailyStats.day,
+                PlayerDailyStats.games,
+                PlayerDailyStats.wins,
+                PlayerDailyStats.kda_sum,
+                PlayerDailyStats.cs_per_min_sum,
+                PlayerDailyStats.cs_games,
+            )
             .where(
                 and_(
-                    MatchParticipant.puuid == puuid,
-                    Match.game_creation >= date_threshold
+                    PlayerDailyStats.puuid == puuid,
+                    PlayerDailyStats.day >= date_threshold
                 )
             )
-            .order_by(Match.game_creation.asc())
+            .order_by(PlayerDailyStats.day.asc())
         )
-        
-        matches_data = result.all()
-        
-        if len(matches_data) < 5:  # Need at least 5 matches for meaningful trends
+        daily_rows = (await db.execute(daily_query)).all()
+
+        if not daily_rows:
+            # Player may have been synced before the aggregate table existed -
+            # build their rows once (lazy materialized-view refresh)
+            if await AnalyticsService.refresh_player_daily_stats(db, puuid):
+                daily_rows = (await db.execute(daily_query)).all()
+
+        total_games = sum(row.games for row in daily_rows)
+        if total_games < 5:  # Need at least 5 matches for meaningful trends
             return {
                 "trend_data": [],
                 "win_rate_trend": "insufficient_data",
                 "kda_trend": "insufficient_data",
                 "cs_trend": "insufficient_data"
             }
-        
-        # Group matches by day
-        daily_stats = defaultdict(lambda: {
-            "matches": [],
-            "date": None
-        })
-        
-        for match, participant in matches_data:
-            date_key = match.game_creation.date()
-            daily_stats[date_key]["matches"].append((match, participant))
-            daily_stats[date_key]["date"] = date_key
-        
-        # Calculate daily aggregates
-        trend_data = []
-        for date_key in sorted(daily_stats.keys()):
-            day_data = daily_stats[date_key]
-            matches = day_data["matches"]
-            
-            if not matches:
-                continue
-            
-            wins = sum(1 for _, p in matches if p.win)
-            total_games = len(matches)
-            
-            # Calculate daily averages
-            avg_kda_values = []
-            avg_cs_values = []
-            
-            for match, participant in matches:
-                kda = (participant.kills + participant.assists) / participant.deaths if participant.deaths > 0 else float(participant.kills + participant.assists)
-                avg_kda_values.append(kda)
-                
-                if match.game_duration > 0:
-                    cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
-                    avg_cs_values.append(cs_per_min)
-            
-            trend_data.append({
-                "date": date_key.isoformat(),
-                "total_games": total_games,
-                "wins": wins,
-                "win_rate": round((wins / total_games) * 100, 1),
-                "avg_kda": round(statistics.mean(avg_kda_values), 2),
-                "avg_cs_per_min": round(statistics.mean(avg_cs_values), 1) if avg_cs_values else 0.0
-            })
-        
+
+        # Daily aggregates come straight from the table; averages are
+        # sum / count so they match the per-match computation exactly
+        trend_data = [
+            {
+                "date": row.day.isoformat(),
+                "total_games": row.games,
+                "wins": row.wins,
+                "win_rate": round((row.wins / row.games) * 100, 1),
+                "avg_kda": round(row.kda_sum / row.games, 2),
+                "avg_cs_per_min": round(row.cs_per_min_sum / row.cs_games, 1) if row.cs_games else 0.0
+            }
+            for row in daily_rows
+        ]
+
         # Calculate overall trends
         if len(trend_data) >= 2:
             # Simple trend analysis (compare first half vs second half)
@@ -295,18 +426,18 @@ class AnalyticsService:
             second_half = trend_data[mid_point:]
             
             # Win rate trend
-            first_half_wr = statistics.mean([d["win_rate"] for d in first_half])
-            second_half_wr = statistics.mean([d["win_rate"] for d in second_half])
+            first_half_wr = statistics.fmean([d["win_rate"] for d in first_half])
+            second_half_wr = statistics.fmean([d["win_rate"] for d in second_half])
             wr_trend = "improving" if second_half_wr > first_half_wr else "declining" if second_half_wr < first_half_wr else "stable"
             
             # KDA trend
-            first_half_kda = statistics.mean([d["avg_kda"] for d in first_half])
-            second_half_kda = statistics.mean([d["avg_kda"] for d in second_half])
+            first_half_kda = statistics.fmean([d["avg_kda"] for d in first_half])
+            second_half_kda = statistics.fmean([d["avg_kda"] for d in second_half])
             kda_trend = "improving" if second_half_kda > first_half_kda else "declining" if second_half_kda < first_half_kda else "stable"
             
             # CS trend
-            first_half_cs = statistics.mean([d["avg_cs_per_min"] for d in first_half if d["avg_cs_per_min"] > 0])
-            second_half_cs = statistics.mean([d["avg_cs_per_min"] for d in second_half if d["avg_cs_per_min"] > 0])
+            first_half_cs = statistics.fmean([d["avg_cs_per_min"] for d in first_half if d["avg_cs_per_min"] > 0])
+            second_half_cs = statistics.fmean([d["avg_cs_per_min"] for d in second_half if d["avg_cs_per_min"] > 0])
             cs_trend = "improving" if second_half_cs > first_half_cs else "declining" if second_half_cs < first_half_cs else "stable"
         else:
             wr_trend = kda_trend = cs_trend = "insufficient_data"
@@ -337,22 +468,46 @@ class AnalyticsService:
             Dictionary with GPI-style metrics (0-10 scale)
         """
         date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get matches
-        result = await db.execute(
-            select(Match, MatchParticipant)
-            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+
+        # One aggregate query; the KDA variance needed for the consistency
+        # score comes from sum(kda) and sum(kda^2), since SQLite has no
+        # built-in stdev aggregate
+        # Branchless KDA: max(deaths, 1) gives the identical result when
+        # deaths == 0 (numerator / 1) without a per-row CASE
+        kda_expr = (
+            (MatchParticipant.kills + MatchParticipant.assists) * 1.0
+            / func.max(MatchParticipant.deaths, 1)
+        )
+        row = (await db.execute(
+            select(
+                func.count().label("total_games"),
+                func.sum(case((MatchParticipant.win, 1), else_=0)).label("wins"),
+                func.avg(MatchParticipant.kills).label("avg_kills"),
+                func.avg(MatchParticipant.deaths).label("avg_deaths"),
+                func.avg(MatchParticipant.total_damage_dealt_to_champions).label("avg_damage"),
+                func.avg(
+                    case(
+                        (Match.game_duration > 0,
+                         MatchParticipant.total_minions_killed / (Match.game_duration / 60.0))
+                    )
+                ).label("avg_cs_per_min"),
+                func.avg(MatchParticipant.vision_score).label("avg_vision"),
+                func.count(func.distinct(MatchParticipant.champion_name)).label("unique_champions"),
+                func.sum(kda_expr).label("kda_sum"),
+                func.sum(kda_expr * kda_expr).label("kda_sq_sum"),
+            )
+            .select_from(MatchParticipant)
+            .join(Match, Match.match_id == MatchParticipant.match_id)
             .where(
                 and_(
                     MatchParticipant.puuid == puuid,
                     Match.game_creation >= date_threshold
                 )
             )
-        )
-        
-        matches_data = result.all()
-        
-        if not matches_data:
+        )).one()
+
+        total_games = row.total_games
+        if not total_games:
             return {
                 "aggression": 0.0,
                 "farming": 0.0,
@@ -361,53 +516,34 @@ class AnalyticsService:
                 "versatility": 0.0,
                 "consistency": 0.0
             }
-        
-        # Calculate metrics
-        total_games = len(matches_data)
-        
+
         # 1. Aggression (based on kills, damage, and combat participation)
-        kills_per_game = statistics.mean([p.kills for _, p in matches_data])
-        damage_values = [p.total_damage_dealt_to_champions for _, p in matches_data]
-        avg_damage = statistics.mean(damage_values)
         # Normalize aggression score (assuming average damage around 15000 for scaling)
-        aggression_score = min(10.0, (kills_per_game * 1.5 + (avg_damage / 2000)) / 2)
-        
-        # 2. Farming (CS per minute)
-        cs_per_min_values = []
-        for match, participant in matches_data:
-            if match.game_duration > 0:
-                cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
-                cs_per_min_values.append(cs_per_min)
-        
-        avg_cs_per_min = statistics.mean(cs_per_min_values) if cs_per_min_values else 0.0
-        # Scale CS per minute (6+ CS/min = good, 8+ = excellent)
-        farming_score = min(10.0, (avg_cs_per_min / 8.0) * 10)
-        
-        # 3. Survivability (inverse of deaths per game)
-        deaths_per_game = statistics.mean([p.deaths for _, p in matches_data])
-        # Scale survivability (fewer deaths = higher score, 3 deaths avg = 7 score)
-        survivability_score = max(0.0, min(10.0, 10 - (deaths_per_game - 2) * 1.5))
-        
-        # 4. Vision (vision score)
-        avg_vision_score = statistics.mean([p.vision_score for _, p in matches_data])
-        # Scale vision score (30+ vision = good, 50+ = excellent)
-        vision_score = min(10.0, (avg_vision_score / 50.0) * 10)
-        
-        # 5. Versatility (champion pool diversity)
-        unique_champions = len(set(p.champion_name for _, p in matches_data))
-        # Scale versatility (5+ champions = good versatility)
-        versatility_score = min(10.0, (unique_champions / 5.0) * 10)
-        
+        aggression_score = min(10.0, ((row.avg_kills or 0.0) * 1.5 + ((row.avg_damage or 0.0) / 2000)) / 2)
+
+        # 2. Farming (CS per minute; 6+ CS/min = good, 8+ = excellent)
+        farming_score = min(10.0, ((row.avg_cs_per_min or 0.0) / 8.0) * 10)
+
+        # 3. Survivability (fewer deaths = higher score, 3 deaths avg = 7 score)
+        survivability_score = max(0.0, min(10.0, 10 - ((row.avg_deaths or 0.0) - 2) * 1.5))
+
+        # 4. Vision (30+ vision = good, 50+ = excellent)
+        vision_score = min(10.0, ((row.avg_vision or 0.0) / 50.0) * 10)
+
+        # 5. Versatility (5+ champions = good versatility)
+        versatility_score = min(10.0, (row.unique_champions / 5.0) * 10)
+
         # 6. Consistency (win rate and performance variance)
-        win_rate = (sum(1 for _, p in matches_data if p.win) / total_games) * 100
-        
-        # Calculate KDA variance for consistency
-        kda_values = []
-        for _, participant in matches_data:
-            kda = (participant.kills + participant.assists) / participant.deaths if participant.deaths > 0 else float(participant.kills + participant.assists)
-            kda_values.append(kda)
-        
-        kda_std_dev = statistics.stdev(kda_values) if len(kda_values) > 1 else 0
+        win_rate = ((row.wins or 0) / total_games) * 100
+
+        # Sample standard deviation from the sums: sqrt((Σx² - (Σx)²/n)/(n-1))
+        if total_games > 1:
+            kda_sum = row.kda_sum or 0.0
+            kda_sq_sum = row.kda_sq_sum or 0.0
+            variance = max(0.0, (kda_sq_sum - (kda_sum * kda_sum) / total_games) / (total_games - 1))
+            kda_std_dev = variance ** 0.5
+        else:
+            kda_std_dev = 0
         
         # Consistency based on win rate and low variance
         consistency_base = (win_rate / 100) * 10  # Win rate component
@@ -440,56 +576,75 @@ class AnalyticsService:
         Returns:
             List of detailed match performance data
         """
+        # Plain column tuples; every value is read once to build the
+        # response dict, so full ORM instances would be pure overhead
         result = await db.execute(
-            select(Match, MatchParticipant)
+            select(
+                Match.match_id,
+                Match.game_creation,
+                Match.game_duration,
+                Match.queue_id,
+                Match.game_mode,
+                MatchParticipant.champion_name,
+                MatchParticipant.champion_id,
+                MatchParticipant.kills,
+                MatchParticipant.deaths,
+                MatchParticipant.assists,
+                MatchParticipant.kda_ratio,
+                MatchParticipant.total_minions_killed,
+                MatchParticipant.total_damage_dealt_to_champions,
+                MatchParticipant.vision_score,
+                MatchParticipant.gold_earned,
+                MatchParticipant.win,
+            )
             .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
             .where(MatchParticipant.puuid == puuid)
             .order_by(Match.game_creation.desc())
             .limit(limit)
         )
-        
+
         matches_data = result.all()
-        
+
         performance_data = []
-        for match, participant in matches_data:
+        for row in matches_data:
             # Calculate derived metrics
-            cs_per_min = participant.total_minions_killed / (match.game_duration / 60) if match.game_duration > 0 else 0
-            damage_per_min = participant.total_damage_dealt_to_champions / (match.game_duration / 60) if match.game_duration > 0 else 0
-            
+            cs_per_min = row.total_minions_killed / (row.game_duration / 60) if row.game_duration > 0 else 0
+            damage_per_min = row.total_damage_dealt_to_champions / (row.game_duration / 60) if row.game_duration > 0 else 0
+
             # Calculate performance score (simple heuristic)
             performance_score = 0
-            performance_score += participant.kills * 3
-            performance_score += participant.assists * 1.5
-            performance_score -= participant.deaths * 2
+            performance_score += row.kills * 3
+            performance_score += row.assists * 1.5
+            performance_score -= row.deaths * 2
             performance_score += (cs_per_min - 5) * 2  # Bonus for CS above 5/min
-            performance_score += (participant.vision_score - 20) * 0.1  # Bonus for vision above 20
-            
+            performance_score += (row.vision_score - 20) * 0.1  # Bonus for vision above 20
+
             # Win bonus
-            if participant.win:
+            if row.win:
                 performance_score += 10
-            
+
             performance_data.append({
-                "match_id": match.match_id,
-                "game_creation": match.game_creation,
-                "duration_minutes": round(match.game_duration / 60, 1),
-                "champion_name": participant.champion_name,
-                "champion_id": participant.champion_id,
-                "kills": participant.kills,
-                "deaths": participant.deaths,
-                "assists": participant.assists,
-                "kda_ratio": participant.kda_ratio,
-                "cs": participant.total_minions_killed,
+                "match_id": row.match_id,
+                "game_creation": row.game_creation,
+                "duration_minutes": round(row.game_duration / 60, 1),
+                "champion_name": row.champion_name,
+                "champion_id": row.champion_id,
+                "kills": row.kills,
+                "deaths": row.deaths,
+                "assists": row.assists,
+                "kda_ratio": row.kda_ratio,
+                "cs": row.total_minions_killed,
                 "cs_per_min": round(cs_per_min, 1),
-                "damage_to_champions": participant.total_damage_dealt_to_champions,
+                "damage_to_champions": row.total_damage_dealt_to_champions,
                 "damage_per_min": round(damage_per_min, 0),
-                "vision_score": participant.vision_score,
-                "gold_earned": participant.gold_earned,
-                "win": participant.win,
+                "vision_score": row.vision_score,
+                "gold_earned": row.gold_earned,
+                "win": row.win,
                 "performance_score": round(performance_score, 1),
-                "queue_id": match.queue_id,
-                "game_mode": match.game_mode
+                "queue_id": row.queue_id,
+                "game_mode": row.game_mode
             })
-        
+
         return performance_data
     
     @staticmethod
@@ -512,9 +667,10 @@ class AnalyticsService:
         """
         date_threshold = datetime.now() - timedelta(days=days)
         
-        # Get matches within timeframe
+        # Get matches within timeframe; the heatmap only needs the timestamp
+        # and duration, so skip hydrating the two full ORM entities
         result = await db.execute(
-            select(Match, MatchParticipant)
+            select(Match.game_creation, Match.game_duration)
             .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
             .where(
                 and_(
@@ -548,17 +704,17 @@ class AnalyticsService:
         day_totals = [0] * 7
         
         # Process each match
-        for match, participant in matches_data:
+        for row in matches_data:
             # Extract day of week and hour from game creation time
-            game_time = match.game_creation
+            game_time = row.game_creation
             day_of_week = game_time.weekday()  # 0=Monday, 6=Sunday
             hour_of_day = game_time.hour
-            
+
             # Increment counters
             heatmap_grid[day_of_week][hour_of_day] += 1
             hour_totals[hour_of_day] += 1
             day_totals[day_of_week] += 1
-            total_duration += match.game_duration
+            total_duration += row.game_duration
         
         # Convert to heatmap format for frontend
         heatmap_data = []
@@ -646,9 +802,23 @@ class AnalyticsService:
         """
         date_threshold = datetime.now() - timedelta(days=days)
         
-        # Get matches within timeframe
+        # Get matches within timeframe as plain column tuples; hydrating
+        # full Match/MatchParticipant instances here would pay identity-map
+        # and per-attribute instrumentation cost for rows read exactly once
         result = await db.execute(
-            select(Match, MatchParticipant)
+            select(
+                Match.game_duration,
+                MatchParticipant.team_position,
+                MatchParticipant.lane,
+                MatchParticipant.win,
+                MatchParticipant.kills,
+                MatchParticipant.deaths,
+                MatchParticipant.assists,
+                MatchParticipant.total_minions_killed,
+                MatchParticipant.total_damage_dealt_to_champions,
+                MatchParticipant.vision_score,
+                MatchParticipant.gold_earned,
+            )
             .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
             .where(
                 and_(
@@ -657,7 +827,7 @@ class AnalyticsService:
                 )
             )
         )
-        
+
         matches_data = result.all()
         
         if not matches_data:
@@ -669,42 +839,50 @@ class AnalyticsService:
                 "role_distribution": {}
             }
         
-        # Group by role/position
-        role_stats = defaultdict(list)
-        role_counts = defaultdict(int)
-        
-        for match, participant in matches_data:
+        # Group and accumulate in one pass: each participant row is touched
+        # once, with running sums per role instead of per-stat list
+        # comprehensions re-walking every group
+        role_totals = defaultdict(lambda: {
+            "games": 0, "wins": 0, "kills": 0, "deaths": 0, "assists": 0,
+            "cs_per_min_sum": 0.0, "cs_games": 0,
+            "damage": 0, "vision": 0, "gold": 0,
+        })
+
+        for row in matches_data:
             # Use team_position as primary role, fallback to lane or "UNKNOWN"
-            role = participant.team_position or participant.lane or "UNKNOWN"
-            role_stats[role].append((match, participant))
-            role_counts[role] += 1
-        
-        # Calculate stats for each role
+            role = row.team_position or row.lane or "UNKNOWN"
+            totals = role_totals[role]
+            totals["games"] += 1
+            if row.win:
+                totals["wins"] += 1
+            totals["kills"] += row.kills
+            totals["deaths"] += row.deaths
+            totals["assists"] += row.assists
+            if row.game_duration > 0:
+                totals["cs_per_min_sum"] += row.total_minions_killed / (row.game_duration / 60)
+                totals["cs_games"] += 1
+            totals["damage"] += row.total_damage_dealt_to_champions
+            totals["vision"] += row.vision_score
+            totals["gold"] += row.gold_earned
+
+        # Calculate stats for each role from the accumulated sums
         role_performance = []
-        for role, role_matches in role_stats.items():
-            total_games = len(role_matches)
-            wins = sum(1 for _, p in role_matches if p.win)
+        for role, totals in role_totals.items():
+            total_games = totals["games"]
+            wins = totals["wins"]
             win_rate = (wins / total_games) * 100 if total_games > 0 else 0
-            
-            # Calculate averages
-            avg_kills = statistics.mean([p.kills for _, p in role_matches])
-            avg_deaths = statistics.mean([p.deaths for _, p in role_matches])
-            avg_assists = statistics.mean([p.assists for _, p in role_matches])
+
+            avg_kills = totals["kills"] / total_games
+            avg_deaths = totals["deaths"] / total_games
+            avg_assists = totals["assists"] / total_games
             avg_kda = (avg_kills + avg_assists) / avg_deaths if avg_deaths > 0 else float('inf')
-            
-            # CS stats
-            cs_per_min_values = []
-            for match, participant in role_matches:
-                if match.game_duration > 0:
-                    cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
-                    cs_per_min_values.append(cs_per_min)
-            avg_cs_per_min = statistics.mean(cs_per_min_values) if cs_per_min_values else 0.0
-            
-            # Other stats
-            avg_damage = statistics.mean([p.total_damage_dealt_to_champions for _, p in role_matches])
-            avg_vision = statistics.mean([p.vision_score for _, p in role_matches])
-            avg_gold = statistics.mean([p.gold_earned for _, p in role_matches])
-            
+
+            avg_cs_per_min = totals["cs_per_min_sum"] / totals["cs_games"] if totals["cs_games"] else 0.0
+
+            avg_damage = totals["damage"] / total_games
+            avg_vision = totals["vision"] / total_games
+            avg_gold = totals["gold"] / total_games
+
             # Calculate performance score (simplified)
             performance_score = (win_rate * 0.4) + (avg_kda * 10) + (avg_cs_per_min * 2) + (avg_vision * 0.1)
             
@@ -734,7 +912,7 @@ class AnalyticsService:
         best_performing_role = max(role_performance, key=lambda x: x["performance_score"])["role"] if role_performance else None
         
         # Create role distribution
-        role_distribution = {role: count for role, count in role_counts.items()}
+        role_distribution = {role: totals["games"] for role, totals in role_totals.items()}
         
         return {
             "role_stats": role_performance,
@@ -766,9 +944,20 @@ class AnalyticsService:
         """
         date_threshold = datetime.now() - timedelta(days=days)
         
-        # Get matches for the specific role
+        # Get matches for the specific role; column tuples are enough here
+        # since every stat is consumed once by the averages below
         result = await db.execute(
-            select(Match, MatchParticipant)
+            select(
+                Match.game_duration,
+                MatchParticipant.win,
+                MatchParticipant.kills,
+                MatchParticipant.deaths,
+                MatchParticipant.assists,
+                MatchParticipant.total_minions_killed,
+                MatchParticipant.total_damage_dealt_to_champions,
+                MatchParticipant.gold_earned,
+                MatchParticipant.vision_score,
+            )
             .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
             .where(
                 and_(
@@ -778,9 +967,9 @@ class AnalyticsService:
                 )
             )
         )
-        
+
         matches_data = result.all()
-        
+
         if not matches_data:
             return {
                 "role": role,
@@ -789,41 +978,33 @@ class AnalyticsService:
                 "insights": [],
                 "recommendations": []
             }
-        
+
         # Calculate role-specific metrics
         total_games = len(matches_data)
-        wins = sum(1 for _, p in matches_data if p.win)
+        wins = sum(1 for row in matches_data if row.win)
         win_rate = (wins / total_games) * 100
-        
+
         # KDA analysis
-        kills = [p.kills for _, p in matches_data]
-        deaths = [p.deaths for _, p in matches_data]
-        assists = [p.assists for _, p in matches_data]
-        
-        avg_kills = statistics.mean(kills)
-        avg_deaths = statistics.mean(deaths)
-        avg_assists = statistics.mean(assists)
-        
+        avg_kills = statistics.fmean(row.kills for row in matches_data)
+        avg_deaths = statistics.fmean(row.deaths for row in matches_data)
+        avg_assists = statistics.fmean(row.assists for row in matches_data)
+
         # CS analysis (more important for certain roles)
         cs_values = []
         cs_per_min_values = []
-        for match, participant in matches_data:
-            cs_values.append(participant.total_minions_killed)
-            if match.game_duration > 0:
-                cs_per_min = participant.total_minions_killed / (match.game_duration / 60)
+        for row in matches_data:
+            cs_values.append(row.total_minions_killed)
+            if row.game_duration > 0:
+                cs_per_min = row.total_minions_killed / (row.game_duration / 60)
                 cs_per_min_values.append(cs_per_min)
-        
-        avg_cs = statistics.mean(cs_values) if cs_values else 0
-        avg_cs_per_min = statistics.mean(cs_per_min_values) if cs_per_min_values else 0
-        
+
+        avg_cs = statistics.fmean(cs_values) if cs_values else 0
+        avg_cs_per_min = statistics.fmean(cs_per_min_values) if cs_per_min_values else 0
+
         # Damage and gold
-        damage_values = [p.total_damage_dealt_to_champions for _, p in matches_data]
-        gold_values = [p.gold_earned for _, p in matches_data]
-        vision_values = [p.vision_score for _, p in matches_data]
-        
-        avg_damage = statistics.mean(damage_values)
-        avg_gold = statistics.mean(gold_values)
-        avg_vision = statistics.mean(vision_values)
+        avg_damage = statistics.fmean(row.total_damage_dealt_to_champions for row in matches_data)
+        avg_gold = statistics.fmean(row.gold_earned for row in matches_data)
+        avg_vision = statistics.fmean(row.vision_score for row in matches_data)
         
         # Role-specific benchmarks (these would ideally come from a larger dataset)
         benchmarks = AnalyticsService._get_role_benchmarks(role)
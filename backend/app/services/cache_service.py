@@ -1,5 +1,4 @@
-import json
-import hashlib
+import fnmatch
 from typing import Any, Optional, Dict, Union
 from datetime import datetime, timedelta
 import asyncio
@@ -14,30 +13,55 @@ class InMemoryCache:
     this provides basic caching functionality
     """
     
-    def __init__(self):
+    def __init__(self, max_entries: int = 2000):
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._lock = asyncio.Lock()
-    
+        # Bound memory per worker; when full, the least-frequently-used
+        # entry is evicted (the policy Redis would run as allkeys-lfu)
+        self.max_entries = max_entries
+        # Process-local counters; incremented on the lookup path so status
+        # snapshots are O(1) reads with no extra round trips
+        self._hits = 0
+        self._misses = 0
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         async with self._lock:
             if key in self._cache:
                 entry = self._cache[key]
                 if datetime.now() < entry['expires_at']:
+                    self._hits += 1
+                    entry['frequency'] += 1
                     return entry['value']
                 else:
                     # Expired, remove it
                     del self._cache[key]
+            self._misses += 1
             return None
-    
+
     async def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
-        """Set value in cache with TTL"""
+        """Set value in cache with TTL, evicting cold entries when full"""
         async with self._lock:
+            if key not in self._cache and len(self._cache) >= self.max_entries:
+                self._evict_one()
             expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
             self._cache[key] = {
                 'value': value,
-                'expires_at': expires_at
+                'expires_at': expires_at,
+                'frequency': 0
             }
+
+    def _evict_one(self) -> None:
+        """Drop one entry: an expired one if available, else the LFU entry"""
+        now = datetime.now()
+        victim = None
+        for key, entry in self._cache.items():
+            if now >= entry['expires_at']:
+                victim = key
+                break
+        if victim is None:
+            victim = min(self._cache, key=lambda k: self._cache[k]['frequency'])
+        del self._cache[victim]
     
     async def delete(self, key: str) -> None:
         """Delete key from cache"""
@@ -50,6 +74,17 @@ class InMemoryCache:
         async with self._lock:
             self._cache.clear()
     
+    async def invalidate_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a glob-style pattern, return count removed"""
+        async with self._lock:
+            matching_keys = [
+                key for key in self._cache
+                if fnmatch.fnmatch(key, pattern)
+            ]
+            for key in matching_keys:
+                del self._cache[key]
+            return len(matching_keys)
+    
     async def cleanup_expired(self) -> int:
         """Remove expired entries and return count of removed items"""
         async with self._lock:
@@ -72,10 +107,15 @@ class InMemoryCache:
         )
         active_entries = total_entries - expired_entries
         
+        lookups = self._hits + self._misses
         return {
             "total_entries": total_entries,
             "active_entries": active_entries,
-            "expired_entries": expired_entries
+            "expired_entries": expired_entries,
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
         }
 
 
@@ -83,17 +123,26 @@ class InMemoryCache:
 cache = InMemoryCache()
 
 
+# Argument types that identify a cached result. Resource handles (the
+# AsyncSession, service instances) are deliberately excluded: their str()
+# embeds the object id, so hashing them gave every request a unique key
+# and the analytics cache could never hit across requests.
+_KEY_SCALARS = (str, int, float, bool)
+
+
 def generate_cache_key(*args, **kwargs) -> str:
-    """Generate a cache key from function arguments"""
-    # Create a string representation of all arguments
-    key_data = {
-        'args': args,
-        'kwargs': kwargs
-    }
-    key_string = json.dumps(key_data, sort_keys=True, default=str)
-    
-    # Create a hash for a consistent, short key
-    return hashlib.md5(key_string.encode()).hexdigest()
+    """Generate a cache key from the scalar function arguments
+
+    Only scalars (puuid, days, limit, ...) participate, so analytics
+    results are keyed by e.g. (puuid, days). Keys stay human-readable,
+    which also lets invalidate_pattern(f"*{puuid}*") match them.
+    """
+    parts = [str(a) for a in args if a is None or isinstance(a, _KEY_SCALARS)]
+    parts.extend(
+        f"{k}={v}" for k, v in sorted(kwargs.items())
+        if v is None or isinstance(v, _KEY_SCALARS)
+    )
+    return ":".join(parts)
 
 
 def cache_result(ttl_seconds: int = 300, key_prefix: str = ""):
@@ -163,12 +212,57 @@ class CacheManager:
             except Exception as e:
                 print(f"❌ Error in cache cleanup: {e}")
     
+    async def get_or_refresh(
+        self,
+        key: str,
+        coro_factory,
+        soft_ttl_seconds: int = 20,
+        stale_ttl_seconds: int = 60,
+        background_tasks=None
+    ) -> Any:
+        """
+        Get a cached value with stale-while-revalidate semantics
+
+        Fresh entries are returned directly. Entries older than the soft TTL
+        are still returned immediately, but a background refresh is scheduled
+        so the next poll sees fresh data - polling clients never wait on the
+        upstream call once the cache is warm.
+
+        Args:
+            key: Cache key
+            coro_factory: Zero-argument callable returning the coroutine that
+                computes a fresh value (must not depend on request-scoped
+                resources, since it may run after the response is sent)
+            soft_ttl_seconds: Age after which a refresh is triggered
+            stale_ttl_seconds: Extra time a stale value may still be served
+            background_tasks: FastAPI BackgroundTasks for the refresh
+        """
+        entry = await cache.get(key)
+        if entry is not None:
+            value, cached_at = entry
+            age = (datetime.now() - cached_at).total_seconds()
+            if age > soft_ttl_seconds and background_tasks is not None:
+                background_tasks.add_task(
+                    self._refresh_entry, key, coro_factory, soft_ttl_seconds, stale_ttl_seconds
+                )
+            return value
+
+        value = await coro_factory()
+        await cache.set(key, (value, datetime.now()), soft_ttl_seconds + stale_ttl_seconds)
+        return value
+
+    async def _refresh_entry(self, key: str, coro_factory, soft_ttl_seconds: int, stale_ttl_seconds: int):
+        """Recompute a cache entry in the background"""
+        try:
+            value = await coro_factory()
+            await cache.set(key, (value, datetime.now()), soft_ttl_seconds + stale_ttl_seconds)
+        except Exception as e:
+            print(f"❌ Error refreshing cache entry {key}: {e}")
+
     async def invalidate_user_cache(self, puuid: str):
         """Invalidate all cache entries for a specific user"""
-        # This is a simple implementation - in production with Redis,
-        # you'd use pattern matching to delete keys
-        await cache.clear()  # For now, clear all cache
-        print(f"🗑️ Invalidated cache for user {puuid[:8]}...")
+        removed_count = await cache.invalidate_pattern(f"*{puuid}*")
+        print(f"🗑️ Invalidated {removed_count} cache entries for user {puuid[:8]}...")
     
     async def get_cache_status(self) -> Dict[str, Any]:
         """Get comprehensive cache status"""
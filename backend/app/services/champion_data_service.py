@@ -1,45 +1,100 @@
+import asyncio
+import time
 from typing import Dict, Optional
+
 from app.services.riot_client import RiotClient
-from app.services.cache_service import cache_champion_data
 
 
 class ChampionDataService:
     """Service for managing champion static data from Riot's Data Dragon API"""
-    
+
+    # Champion metadata only changes per patch, so keep the parsed mapping
+    # in-process and refresh it once the TTL expires
     _champion_data_cache: Optional[Dict[int, str]] = None
-    
+    _champion_data_expires: float = 0.0
+    _champion_data_lock = asyncio.Lock()
+
+    CHAMPION_DATA_TTL_SECONDS = 86400  # Refresh once per day
+
     @staticmethod
-    @cache_champion_data(ttl_seconds=86400)  # Cache for 24 hours
     async def get_champion_id_to_name_mapping() -> Dict[int, str]:
         """
         Get a mapping of champion IDs to names from Data Dragon API
-        
+
+        The mapping is memoized for the lifetime of the process with a TTL,
+        so repeated calls avoid re-fetching and re-parsing the DDragon JSON.
+
         Returns:
             Dictionary mapping champion IDs (int) to champion names (str)
         """
-        riot_client = RiotClient()
-        champion_data = await riot_client.get_champion_data()
-        
-        if not champion_data or 'data' not in champion_data:
+        now = time.time()
+        if (ChampionDataService._champion_data_cache is not None
+                and now < ChampionDataService._champion_data_expires):
+            return ChampionDataService._champion_data_cache
+
+        async with ChampionDataService._champion_data_lock:
+            # Re-check after acquiring the lock so concurrent callers only
+            # trigger a single DDragon fetch
+            now = time.time()
+            if (ChampionDataService._champion_data_cache is not None
+                    and now < ChampionDataService._champion_data_expires):
+                return ChampionDataService._champion_data_cache
+
+            riot_client = RiotClient()
+            champion_data = await riot_client.get_champion_data()
+
+            if not champion_data or 'data' not in champion_data:
+                # Serve stale data rather than nothing if the fetch fails
+                return ChampionDataService._champion_data_cache or {}
+
+            # Build mapping from champion key (ID) to name
+            id_to_name = {}
+            for champion_info in champion_data['data'].values():
+                champion_id = int(champion_info['key'])
+                champion_name = champion_info['name']
+                id_to_name[champion_id] = champion_name
+
+            ChampionDataService._champion_data_cache = id_to_name
+            ChampionDataService._champion_data_expires = (
+                time.time() + ChampionDataService.CHAMPION_DATA_TTL_SECONDS
+            )
+
+            return id_to_name
+
+    @staticmethod
+    async def get_champion_names_by_ids(champion_ids: set[int]) -> Dict[int, str]:
+        """
+        Resolve multiple champion IDs to names with a single mapping fetch
+
+        Args:
+            champion_ids: Set of champion IDs to resolve
+
+        Returns:
+            Dictionary mapping each requested ID to its champion name,
+            with fallback "Champion {id}" for unknown IDs
+        """
+        if not champion_ids:
             return {}
-        
-        # Build mapping from champion key (ID) to name
-        id_to_name = {}
-        for champion_info in champion_data['data'].values():
-            champion_id = int(champion_info['key'])
-            champion_name = champion_info['name']
-            id_to_name[champion_id] = champion_name
-        
-        return id_to_name
-    
+
+        try:
+            id_to_name_mapping = await ChampionDataService.get_champion_id_to_name_mapping()
+        except Exception:
+            # Fallback if API fails
+            id_to_name_mapping = {}
+
+        return {
+            champion_id: id_to_name_mapping.get(champion_id, f"Champion {champion_id}")
+            for champion_id in champion_ids
+        }
+
     @staticmethod
     async def get_champion_name_by_id(champion_id: int) -> str:
         """
         Get champion name by ID, with fallback to generic name
-        
+
         Args:
             champion_id: The champion ID
-            
+
         Returns:
             Champion name or fallback "Champion {id}"
         """
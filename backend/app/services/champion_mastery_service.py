@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -96,37 +97,66 @@ class ChampionMasteryService:
         db: AsyncSession,
         puuid: str,
         region: str
-    ) -> List[ChampionMastery]:
+    ) -> List[Dict[str, Any]]:
         """
         Fetch champion masteries from Riot API and store them in database
-        
+
+        All fetched masteries are written with a single bulk upsert instead
+        of one SELECT + INSERT/UPDATE round-trip per champion.
+
         Args:
             db: Database session
             puuid: Player PUUID
             region: Region for API calls
-        
+
         Returns:
-            List of stored ChampionMastery objects
+            List of stored mastery row dictionaries
         """
         riot_client = RiotClient()
-        
+
         # Get masteries from Riot API
         mastery_data_list = await riot_client.get_champion_masteries(puuid, region)
         print(f"🏆 Riot API returned {len(mastery_data_list)} champion masteries")
-        
-        stored_masteries = []
+
+        if not mastery_data_list:
+            return []
+
+        # Build all rows up front for a single multi-row statement
+        rows = []
         for mastery_data in mastery_data_list:
-            # Store each mastery in database
-            stored_mastery = await ChampionMasteryService.store_mastery_data(
-                db, puuid, mastery_data
-            )
-            stored_masteries.append(stored_mastery)
-        
-        # Commit all changes
+            rows.append({
+                "puuid": puuid,
+                "champion_id": mastery_data["championId"],
+                "mastery_level": mastery_data.get("championLevel", 0),
+                "mastery_points": mastery_data.get("championPoints", 0),
+                "points_until_next_level": mastery_data.get("championPointsUntilNextLevel"),
+                "chest_granted": mastery_data.get("chestGranted", False),
+                "tokens_earned": mastery_data.get("tokensEarned", 0),
+                "last_play_time": datetime.fromtimestamp(
+                    mastery_data["lastPlayTime"] / 1000
+                ) if mastery_data.get("lastPlayTime") else None,
+                "updated_at": datetime.now(),
+            })
+
+        stmt = sqlite_upsert(ChampionMastery).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["puuid", "champion_id"],
+            set_={
+                "mastery_level": stmt.excluded.mastery_level,
+                "mastery_points": stmt.excluded.mastery_points,
+                "points_until_next_level": stmt.excluded.points_until_next_level,
+                "chest_granted": stmt.excluded.chest_granted,
+                "tokens_earned": stmt.excluded.tokens_earned,
+                "last_play_time": stmt.excluded.last_play_time,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+
+        await db.execute(stmt)
         await db.commit()
-        print(f"✅ Stored {len(stored_masteries)} champion masteries for PUUID: {puuid}")
-        
-        return stored_masteries
+        print(f"✅ Stored {len(rows)} champion masteries for PUUID: {puuid}")
+
+        return rows
     
     @staticmethod
     @cache_champion_data(ttl_seconds=1800)  # Cache for 30 minutes
@@ -148,13 +178,24 @@ class ChampionMasteryService:
                 "points_until_next_level": mastery.points_until_next_level,
                 "chest_granted": mastery.chest_granted,
                 "tokens_earned": mastery.tokens_earned,
-                "last_play_time": mastery.last_play_time.isoformat() if mastery.last_play_time else None,
+                "last_play_time": mastery.last_play_time,
                 "mastery_progress_percentage": mastery.mastery_progress_percentage,
-                "updated_at": mastery.updated_at.isoformat() if mastery.updated_at else None
+                "updated_at": mastery.updated_at
             })
         
         return formatted_masteries
     
+    @staticmethod
+    async def get_masteries_version(
+        db: AsyncSession,
+        puuid: str
+    ) -> Optional[datetime]:
+        """Get the most recent mastery update time, used as a data version for ETags"""
+        result = await db.execute(
+            select(func.max(ChampionMastery.updated_at)).where(ChampionMastery.puuid == puuid)
+        )
+        return result.scalar()
+
     @staticmethod
     async def get_mastery_stats_summary(
         db: AsyncSession, 
@@ -0,0 +1,57 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict
+
+from fastapi import HTTPException
+
+
+class ConcurrencyLimiter:
+    """
+    Per-user limiter that bounds concurrent in-flight requests
+
+    The heavy analytics endpoints fan out into several DB queries each, so
+    unlimited concurrent hits for one player could saturate the connection
+    pool. This caps in-flight requests per user key; excess requests are
+    rejected with HTTP 429 instead of queueing.
+    """
+
+    def __init__(self, limit: int = 5):
+        self.limit = limit
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, user_key: str) -> bool:
+        """Try to reserve a slot for the user; returns False when at the limit"""
+        async with self._lock:
+            if self._in_flight[user_key] >= self.limit:
+                return False
+            self._in_flight[user_key] += 1
+            return True
+
+    async def release(self, user_key: str) -> None:
+        """Release a previously acquired slot"""
+        async with self._lock:
+            self._in_flight[user_key] -= 1
+            if self._in_flight[user_key] <= 0:
+                del self._in_flight[user_key]
+
+    def get_status(self) -> Dict[str, int]:
+        """Get current in-flight counts for monitoring"""
+        return dict(self._in_flight)
+
+
+# Global limiter for expensive analytics endpoints
+concurrency_limiter = ConcurrencyLimiter(limit=5)
+
+
+async def concurrency_guard(puuid: str):
+    """FastAPI dependency that caps concurrent heavy requests per player"""
+    if not await concurrency_limiter.acquire(puuid):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many concurrent analytics requests for this player"
+        )
+    try:
+        yield
+    finally:
+        await concurrency_limiter.release(puuid)
@@ -5,47 +5,82 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import selectinload
 
+from app.core.database import AsyncSessionLocal
 from app.models.live_game import LiveGame, LiveGameParticipant, LiveGameSnapshot, PlayerLiveGameHistory
 from app.models.summoner import Summoner
 from app.services.riot_client import RiotClient
-from app.services.cache_service import cache_live_data
+from app.services.cache_service import cache, cache_live_data
 from app.services.analytics_service import AnalyticsService
 
 
+async def _run_with_own_session(service_call, *args):
+    """
+    Run a service call with its own database session.
+
+    AsyncSession is not safe for concurrent use, so analysis steps fanned
+    out via asyncio.gather each get a fresh session from the factory.
+    """
+    async with AsyncSessionLocal() as session:
+        return await service_call(session, *args)
+
+
 class LiveGameService:
     """Service for managing live game detection, analysis, and enemy scouting"""
-    
+
     @staticmethod
     async def check_player_live_status(
-        db: AsyncSession, 
-        puuid: str, 
-        region: str
+        db: AsyncSession,
+        puuid: str,
+        region: str,
+        summoner: Optional[Summoner] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Check if a player is currently in a live game
-        
+
         Args:
             db: Database session
             puuid: Player PUUID
             region: Region for API calls
-            
+            summoner: Pre-loaded summoner record, if the caller already has it
+
         Returns:
             Live game data with analysis if player is in game, None otherwise
         """
         riot_client = RiotClient()
-        
+
         # Check for active game using Riot API
         active_game = await riot_client.check_if_in_game(puuid, region)
-        
+
         if not active_game:
             return None
-        
+
         # Store or update live game in database
         live_game = await LiveGameService._store_live_game_data(db, active_game, region)
-        
-        # Perform enemy team analysis
-        enemy_analysis = await LiveGameService._analyze_enemy_team(db, live_game, puuid, region)
-        
+
+        # Resolve the player's team once and share it across the analysis steps
+        target_team_id = await LiveGameService._get_player_team_id(db, live_game, puuid, summoner)
+
+        # End the read transaction so this session's pooled connection is
+        # returned before we await children that each need their own -
+        # otherwise enough concurrent parents can park on the pool while
+        # holding the very connections their children are waiting for.
+        # expire_on_commit=False keeps live_game's attributes loaded.
+        await db.commit()
+
+        # The analysis steps are independent read paths - run them
+        # concurrently so total latency is the slowest step, not the sum
+        (
+            enemy_analysis,
+            your_team,
+            enemy_team,
+            recommendations
+        ) = await asyncio.gather(
+            _run_with_own_session(LiveGameService._analyze_enemy_team, live_game, puuid, region, target_team_id),
+            _run_with_own_session(LiveGameService._get_team_composition, live_game, "ally", target_team_id),
+            _run_with_own_session(LiveGameService._get_team_composition, live_game, "enemy", target_team_id),
+            _run_with_own_session(LiveGameService._generate_game_recommendations, live_game, puuid)
+        )
+
         # Create comprehensive response
         return {
             "is_in_game": True,
@@ -59,11 +94,11 @@ class LiveGameService:
                 "spectator_delay": live_game.spectator_delay
             },
             "team_composition": {
-                "your_team": await LiveGameService._get_team_composition(db, live_game, puuid, "ally"),
-                "enemy_team": await LiveGameService._get_team_composition(db, live_game, puuid, "enemy")
+                "your_team": your_team,
+                "enemy_team": enemy_team
             },
             "enemy_analysis": enemy_analysis,
-            "recommendations": await LiveGameService._generate_game_recommendations(db, live_game, puuid)
+            "recommendations": recommendations
         }
     
     @staticmethod
@@ -155,15 +190,17 @@ class LiveGameService:
     
     @staticmethod
     async def _analyze_enemy_team(
-        db: AsyncSession, 
-        live_game: LiveGame, 
-        target_puuid: str, 
-        region: str
+        db: AsyncSession,
+        live_game: LiveGame,
+        target_puuid: str,
+        region: str,
+        target_team_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """Analyze enemy team for scouting and strategy recommendations"""
-        
-        # Get target player's team ID
-        target_team_id = await LiveGameService._get_player_team_id(db, live_game, target_puuid)
+
+        # Get target player's team ID unless the caller already resolved it
+        if target_team_id is None:
+            target_team_id = await LiveGameService._get_player_team_id(db, live_game, target_puuid)
         if not target_team_id:
             return {"error": "Could not determine player's team"}
         
@@ -191,13 +228,22 @@ class LiveGameService:
             "recommended_strategies": []
         }
         
-        for participant in enemy_participants:
-            # Analyze individual enemy players
-            player_analysis = await LiveGameService._analyze_enemy_player(
-                db, participant, region
+        # Release this session's connection before the nested fan-out below;
+        # each child takes its own connection from the same pool
+        await db.commit()
+
+        # Analyze all enemy players concurrently - each analysis is an
+        # independent read path, so the lookups overlap
+        player_analyses = await asyncio.gather(
+            *(
+                _run_with_own_session(LiveGameService._analyze_enemy_player, participant, region)
+                for participant in enemy_participants
             )
+        )
+
+        for participant, player_analysis in zip(enemy_participants, player_analyses):
             enemy_analysis["individual_analysis"].append(player_analysis)
-            
+
             # Determine threat level
             if player_analysis.get("threat_level") == "high":
                 enemy_analysis["team_threats"].append({
@@ -341,22 +387,29 @@ class LiveGameService:
     
     @staticmethod
     async def _get_team_composition(
-        db: AsyncSession, 
-        live_game: LiveGame, 
-        target_puuid: str, 
-        team_type: str  # "ally" or "enemy"
+        db: AsyncSession,
+        live_game: LiveGame,
+        team_type: str,  # "ally" or "enemy"
+        target_team_id: Optional[int]
     ) -> List[Dict[str, Any]]:
         """Get team composition for specified team"""
-        
-        target_team_id = await LiveGameService._get_player_team_id(db, live_game, target_puuid)
+
         if not target_team_id:
             return []
-        
+
         if team_type == "ally":
             team_id = target_team_id
         else:  # enemy
             team_id = 200 if target_team_id == 100 else 100
-        
+
+        # The roster is fixed once the game starts, but every poll (and
+        # every viewer of the same game) rebuilt these ten dicts from a
+        # fresh SELECT; memoize per (game, team) for the poll window
+        comp_key = f"live_games:team_comp:{live_game.game_id}:{team_id}"
+        cached_comp = await cache.get(comp_key)
+        if cached_comp is not None:
+            return cached_comp
+
         result = await db.execute(
             select(LiveGameParticipant).where(
                 and_(
@@ -377,17 +430,19 @@ class LiveGameService:
                 "spell2_id": participant.spell2_id,
                 "perks": participant.perks
             })
-        
+
+        await cache.set(comp_key, team_comp, ttl_seconds=300)
         return team_comp
     
     @staticmethod
     async def _get_player_team_id(
-        db: AsyncSession, 
-        live_game: LiveGame, 
-        target_puuid: str
+        db: AsyncSession,
+        live_game: LiveGame,
+        target_puuid: str,
+        summoner: Optional[Summoner] = None
     ) -> Optional[int]:
         """Get the team ID for the target player"""
-        
+
         # First, try to find by PUUID if we have it stored
         result = await db.execute(
             select(LiveGameParticipant).where(
@@ -398,16 +453,18 @@ class LiveGameService:
             )
         )
         participant = result.scalar_one_or_none()
-        
+
         if participant:
             return participant.team_id
-        
-        # If not found by PUUID, try to match by summoner data
-        summoner_result = await db.execute(
-            select(Summoner).where(Summoner.puuid == target_puuid)
-        )
-        summoner = summoner_result.scalar_one_or_none()
-        
+
+        # If not found by PUUID, try to match by summoner data; skip the
+        # lookup when the caller pre-loaded the record
+        if summoner is None:
+            summoner_result = await db.execute(
+                select(Summoner).where(Summoner.puuid == target_puuid)
+            )
+            summoner = summoner_result.scalar_one_or_none()
+
         if summoner:
             result = await db.execute(
                 select(LiveGameParticipant).where(
@@ -473,38 +530,59 @@ class LiveGameService:
     @staticmethod
     @cache_live_data(ttl_seconds=30)  # Cache for 30 seconds for real-time updates
     async def get_live_game_status(
-        db: AsyncSession, 
-        puuid: str, 
-        region: str
+        db: AsyncSession,
+        puuid: str,
+        region: str,
+        summoner: Optional[Summoner] = None
     ) -> Dict[str, Any]:
         """
         Cached method to get live game status with minimal API calls
         """
-        return await LiveGameService.check_player_live_status(db, puuid, region)
-    
+        return await LiveGameService.check_player_live_status(db, puuid, region, summoner)
+
     @staticmethod
     async def monitor_player_games(
-        db: AsyncSession, 
-        puuid_list: List[str], 
-        region: str
+        db: AsyncSession,
+        puuid_list: List[str],
+        region: str,
+        summoners_by_puuid: Optional[Dict[str, Summoner]] = None
     ) -> Dict[str, Any]:
         """
         Monitor multiple players for live games (useful for friends/teams)
+
+        Summoner records for the whole list are loaded in one IN query (or
+        accepted pre-loaded from the caller) instead of one lookup per
+        player, and each status check runs on its own session so the Riot
+        round trips overlap safely.
         """
+        if summoners_by_puuid is None:
+            result = await db.execute(
+                select(Summoner).where(Summoner.puuid.in_(puuid_list))
+            )
+            summoners_by_puuid = {s.puuid: s for s in result.scalars().all()}
+
+        # Same pool-safety rule as check_player_live_status: give the
+        # caller's connection back before fanning out per-player sessions
+        await db.commit()
+
+        async def check_with_own_session(puuid: str):
+            # AsyncSession is not safe for concurrent use, so each task gets
+            # a fresh session from the factory
+            async with AsyncSessionLocal() as session:
+                return await LiveGameService.get_live_game_status(
+                    session, puuid, region, summoner=summoners_by_puuid.get(puuid)
+                )
+
+        live_statuses = await asyncio.gather(
+            *(check_with_own_session(puuid) for puuid in puuid_list),
+            return_exceptions=True
+        )
+
         results = {}
-        
-        # Check all players concurrently
-        tasks = []
-        for puuid in puuid_list:
-            tasks.append(LiveGameService.get_live_game_status(db, puuid, region))
-        
-        live_statuses = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for i, puuid in enumerate(puuid_list):
-            status = live_statuses[i]
+        for puuid, status in zip(puuid_list, live_statuses):
             if isinstance(status, Exception):
                 results[puuid] = {"error": str(status)}
             else:
                 results[puuid] = status or {"is_in_game": False}
-        
+
         return results
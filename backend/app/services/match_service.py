@@ -1,12 +1,18 @@
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from typing import Optional, List, Dict, Any
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
+from app.core.config import settings
 from app.models.match import Match, MatchParticipant
 from app.models.summoner import Summoner
 from app.services.riot_client import RiotClient
 
+logger = logging.getLogger(__name__)
+
 
 class MatchService:
     """Service for managing match data in the database"""
@@ -47,20 +53,72 @@ class MatchService:
         puuid: str, 
         limit: int = 20,
         offset: int = 0
-    ) -> List[Match]:
-        """Get matches for a specific summoner by PUUID"""
+    ) -> Tuple[List[Match], int]:
+        """
+        Get a page of matches for a summoner plus the real total match count
+
+        The total comes from COUNT(*) OVER () in the same query, so
+        pagination gets the full count without a second round trip.
+
+        Returns:
+            (matches for this page, total matches for the player)
+        """
+        from sqlalchemy.orm import noload
+        # Participants are intentionally not loaded here; history responses
+        # validate matches straight from the ORM rows and noload keeps that
+        # from triggering a lazy load per match
         result = await db.execute(
-            select(Match)
+            select(Match, func.count().over().label("total"))
+            .options(noload(Match.participants))
             .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
             .where(MatchParticipant.puuid == puuid)
             .order_by(Match.game_creation.desc())
             .limit(limit)
             .offset(offset)
         )
-        matches = result.scalars().all()
-        print(f"📊 Database query returned {len(matches)} matches for PUUID {puuid[:8]}... (limit: {limit})")
-        return matches
+        rows = result.all()
+        matches = [row[0] for row in rows]
+        total = rows[0].total if rows else 0
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query returned %d of %d matches for PUUID %s... (limit: %d)", len(matches), total, puuid[:8], limit)
+        return matches, total
     
+    @staticmethod
+    async def get_player_performance_rows(
+        db: AsyncSession,
+        puuid: str,
+        limit: int = 20
+    ) -> List[tuple]:
+        """
+        Get a player's recent matches with their participant stats in one query
+
+        Returns column-tuple rows (no ORM hydration) ordered by newest first,
+        so callers avoid one participant lookup per match; fields are accessed
+        by name (row.match_id, row.kills, ...).
+        """
+        result = await db.execute(
+            select(
+                Match.match_id,
+                Match.game_creation,
+                Match.duration_minutes,
+                MatchParticipant.champion_name,
+                MatchParticipant.kills,
+                MatchParticipant.deaths,
+                MatchParticipant.assists,
+                MatchParticipant.kda_ratio,
+                MatchParticipant.total_minions_killed,
+                MatchParticipant.gold_earned,
+                MatchParticipant.total_damage_dealt_to_champions,
+                MatchParticipant.vision_score,
+                MatchParticipant.win,
+            )
+            .join(MatchParticipant, Match.match_id == MatchParticipant.match_id)
+            .where(MatchParticipant.puuid == puuid)
+            .order_by(Match.game_creation.desc())
+            .limit(limit)
+        )
+        return result.all()
+
     @staticmethod
     async def get_match_participant(
         db: AsyncSession, 
@@ -97,12 +155,7 @@ class MatchService:
         """
         info = match_data.get("info", {})
         metadata = match_data.get("metadata", {})
-        
-        # Check if match already exists
-        existing_match = await MatchService.get_match_by_id(db, metadata.get("matchId"))
-        if existing_match:
-            return existing_match
-        
+
         # Convert timestamps from milliseconds to datetime
         game_creation = datetime.fromtimestamp(info.get("gameCreation", 0) / 1000)
         game_start = datetime.fromtimestamp(info.get("gameStartTimestamp", 0) / 1000) if info.get("gameStartTimestamp") else None
@@ -116,8 +169,9 @@ class MatchService:
                 winning_team = team.get("teamId")
                 break
         
-        # Create Match object
-        match = Match(
+        # Upsert the match in one atomic statement: no existence SELECT, and
+        # re-ingesting a known match refreshes its data in place
+        match_stmt = sqlite_insert(Match).values(
             match_id=metadata.get("matchId"),
             game_creation=game_creation,
             game_start=game_start,
@@ -131,42 +185,67 @@ class MatchService:
             queue_id=info.get("queueId", 0),
             tournament_code=info.get("tournamentCode"),
             winning_team=winning_team,
-            teams_data=teams,  # Store raw teams data as JSON
+            # Raw teams payload is archival (winning_team is already typed)
+            teams_data=teams if settings.STORE_RAW_PAYLOADS else None,
         )
-        
-        db.add(match)
-        await db.flush()  # Flush to get the match available for participants
-        
-        # Store participants
-        participants = info.get("participants", [])
-        for participant_data in participants:
-            await MatchService._store_participant_data(
-                db, match.match_id, participant_data, region
+        match_stmt = match_stmt.on_conflict_do_update(
+            index_elements=["match_id"],
+            set_={
+                "game_creation": match_stmt.excluded.game_creation,
+                "game_start": match_stmt.excluded.game_start,
+                "game_end": match_stmt.excluded.game_end,
+                "game_duration": match_stmt.excluded.game_duration,
+                "game_mode": match_stmt.excluded.game_mode,
+                "game_type": match_stmt.excluded.game_type,
+                "game_version": match_stmt.excluded.game_version,
+                "map_id": match_stmt.excluded.map_id,
+                "platform_id": match_stmt.excluded.platform_id,
+                "queue_id": match_stmt.excluded.queue_id,
+                "tournament_code": match_stmt.excluded.tournament_code,
+                "winning_team": match_stmt.excluded.winning_team,
+                "teams_data": match_stmt.excluded.teams_data,
+                # Core DML bypasses the ORM-level onupdate, so bump it here
+                "updated_at": func.now(),
+            },
+        ).returning(Match)
+
+        result = await db.execute(
+            match_stmt, execution_options={"populate_existing": True}
+        )
+        match = result.scalar_one()
+
+        # Store all participants with one multi-row insert instead of a
+        # per-participant existence check + add (1 statement instead of ~20)
+        participant_rows = [
+            MatchService._participant_row(
+                match.match_id, participant_data, info.get("gameDuration", 0)
             )
-        
+            for participant_data in info.get("participants", [])
+        ]
+        if participant_rows:
+            await db.execute(
+                sqlite_insert(MatchParticipant)
+                .values(participant_rows)
+                .on_conflict_do_nothing(index_elements=["match_id", "puuid"])
+            )
+
         await db.commit()
-        await db.refresh(match)
+        # No refresh needed: sessions run with expire_on_commit=False, so the
+        # object's attributes survive the commit without a re-SELECT
         return match
     
     @staticmethod
-    async def _store_participant_data(
-        db: AsyncSession,
+    def _participant_row(
         match_id: str,
         participant_data: Dict[str, Any],
-        region: str
-    ) -> MatchParticipant:
-        """Store participant data for a match"""
-        puuid = participant_data.get("puuid")
-        
-        # Check if participant already exists
-        existing_participant = await MatchService.get_match_participant(db, match_id, puuid)
-        if existing_participant:
-            return existing_participant
-        
-        # Create MatchParticipant object
-        participant = MatchParticipant(
+        game_duration: int
+    ) -> Dict[str, Any]:
+        """Build an insert row for a match participant"""
+        return dict(
             match_id=match_id,
-            puuid=puuid,
+            # Denormalized so the cs_per_minute generated column needs no join
+            game_duration_seconds=game_duration,
+            puuid=participant_data.get("puuid"),
             participant_id=participant_data.get("participantId", 0),
             team_id=participant_data.get("teamId", 0),
             
@@ -225,24 +304,20 @@ class MatchService:
             # Match outcome
             win=participant_data.get("win", False),
             
-            # Items (store as JSON)
-            items={
-                "item0": participant_data.get("item0", 0),
-                "item1": participant_data.get("item1", 0),
-                "item2": participant_data.get("item2", 0),
-                "item3": participant_data.get("item3", 0),
-                "item4": participant_data.get("item4", 0),
-                "item5": participant_data.get("item5", 0),
-                "item6": participant_data.get("item6", 0),  # Trinket
-            },
+            # Items, one column per slot
+            item0=participant_data.get("item0", 0),
+            item1=participant_data.get("item1", 0),
+            item2=participant_data.get("item2", 0),
+            item3=participant_data.get("item3", 0),
+            item4=participant_data.get("item4", 0),
+            item5=participant_data.get("item5", 0),
+            trinket=participant_data.get("item6", 0),
             
-            # Store complete raw data for future analysis
-            raw_data=participant_data
+            # Raw payload is archival only; deployments that trust the typed
+            # columns can switch it off to keep rows narrow
+            raw_data=participant_data if settings.STORE_RAW_PAYLOADS else None
         )
-        
-        db.add(participant)
-        return participant
-    
+
     @staticmethod
     async def fetch_and_store_recent_matches(
         db: AsyncSession,
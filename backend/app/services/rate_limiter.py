@@ -123,12 +123,24 @@ class AdaptiveRateLimiter(RateLimiter):
     and handles 429 (rate limit exceeded) responses
     """
     
-    def __init__(self, **kwargs):
+    def __init__(self, min_concurrency: int = 1, max_concurrency: int = 8, **kwargs):
         super().__init__(**kwargs)
         self.backoff_multiplier = 1.0
         self.last_429_time: Optional[float] = None
         self.retry_after: Optional[float] = None
-    
+
+        # AIMD concurrency control: additively grow the in-flight cap while
+        # requests succeed, halve it whenever the API pushes back (429/5xx).
+        # This keeps burst sources like monitor_multiple_players from
+        # overshooting the key's true rate limit
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency_increase = 0.5  # additive step on success
+        self.concurrency_decrease = 0.5  # multiplicative factor on pushback
+        self._concurrency_limit: float = float(max_concurrency)
+        self._in_flight = 0
+        self._slot_available = asyncio.Condition()
+
     async def handle_rate_limit_response(self, status_code: int, headers: Dict[str, str]) -> None:
         """
         Handle rate limit information from API response headers
@@ -139,7 +151,7 @@ class AdaptiveRateLimiter(RateLimiter):
         """
         if status_code == 429:  # Rate limit exceeded
             self.last_429_time = time.time()
-            
+
             # Check for Retry-After header
             retry_after = headers.get('Retry-After') or headers.get('retry-after')
             if retry_after:
@@ -149,14 +161,47 @@ class AdaptiveRateLimiter(RateLimiter):
                 # Default backoff if no Retry-After header
                 self.backoff_multiplier = min(self.backoff_multiplier * 2, 60.0)
                 print(f"🚫 Rate limit exceeded! Backing off for {self.backoff_multiplier} seconds")
-        
+
+            await self._decrease_concurrency()
+
+        elif status_code >= 500:
+            # Server trouble - ease off the same way as a rate limit
+            await self._decrease_concurrency()
+
         elif status_code == 200:
-            # Successful request, reset backoff
+            # Successful request, reset backoff and grow the in-flight cap
             self.backoff_multiplier = 1.0
             self.retry_after = None
+            await self._increase_concurrency()
+
+    async def _decrease_concurrency(self) -> None:
+        """Halve the concurrency cap (multiplicative decrease)"""
+        async with self._slot_available:
+            self._concurrency_limit = max(
+                float(self.min_concurrency),
+                self._concurrency_limit * self.concurrency_decrease
+            )
+            print(f"📉 Riot API concurrency cap lowered to {self._concurrency_limit:.1f}")
+
+    async def _increase_concurrency(self) -> None:
+        """Grow the concurrency cap by one additive step"""
+        async with self._slot_available:
+            if self._concurrency_limit < self.max_concurrency:
+                self._concurrency_limit = min(
+                    float(self.max_concurrency),
+                    self._concurrency_limit + self.concurrency_increase
+                )
+                self._slot_available.notify_all()
     
     async def acquire(self, endpoint: Optional[str] = None) -> bool:
-        """Enhanced acquire that considers 429 backoff"""
+        """Enhanced acquire that considers 429 backoff and the concurrency cap"""
+        # Wait for an in-flight slot under the current AIMD cap; callers must
+        # pair this with release() once the response has been handled
+        async with self._slot_available:
+            while self._in_flight >= int(self._concurrency_limit):
+                await self._slot_available.wait()
+            self._in_flight += 1
+
         # Check if we're in a backoff period from a 429 response
         if self.retry_after:
             wait_time = self.retry_after
@@ -175,6 +220,12 @@ class AdaptiveRateLimiter(RateLimiter):
         # Use parent class logic for normal rate limiting
         return await super().acquire(endpoint)
 
+    async def release(self) -> None:
+        """Release the in-flight slot taken by acquire"""
+        async with self._slot_available:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._slot_available.notify_all()
+
 
 # Global rate limiter instance
 rate_limiter = AdaptiveRateLimiter()
@@ -185,6 +236,11 @@ async def rate_limited_request(endpoint: Optional[str] = None):
     await rate_limiter.acquire(endpoint)
 
 
+async def release_request():
+    """Release the in-flight slot once the API response has been handled"""
+    await rate_limiter.release()
+
+
 def update_rate_limiter_from_response(status_code: int, headers: Dict[str, str]):
     """Update rate limiter based on API response"""
     asyncio.create_task(rate_limiter.handle_rate_limit_response(status_code, headers))
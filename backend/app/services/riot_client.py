@@ -1,10 +1,39 @@
+import asyncio
+import logging
+import random
+
 import httpx
+import orjson
 from typing import Optional, Dict, Any, List
 from app.core.config import settings
-from .rate_limiter import rate_limited_request, update_rate_limiter_from_response
+from .rate_limiter import rate_limited_request, release_request, update_rate_limiter_from_response
+
+logger = logging.getLogger(__name__)
+
+
+class RiotRateLimitError(ValueError):
+    """Raised when Riot still returns 429 after in-client retries
+
+    Subclasses ValueError so existing fallback handlers keep working;
+    carries Riot's Retry-After so the API can surface a real 429 (with
+    the header) to clients instead of a 500.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
 
 
 class RiotClient:
+    # One shared HTTP client (keep-alive connection pool) for every
+    # RiotClient instance; created lazily so it binds to the running loop.
+    # Connection reuse matters far more than request parsing for Riot API
+    # latency, so per-call RiotClient() construction stays cheap
+    _http_client: Optional[httpx.AsyncClient] = None
+
+    # How many times a single request retries a 429 before giving up
+    MAX_RATE_LIMIT_RETRIES = 3
+
     def __init__(self):
         self.api_key = settings.RIOT_API_KEY
         self.timeout = 30.0
@@ -38,6 +67,27 @@ class RiotClient:
             "kr": "asia", "jp1": "asia", "oc1": "asia",
         }
     
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Get the shared pooled HTTP client, creating it on first use"""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=64,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return cls._http_client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client pool (call on application shutdown)"""
+        if cls._http_client is not None and not cls._http_client.is_closed:
+            await cls._http_client.aclose()
+        cls._http_client = None
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for Riot API requests"""
         return {
@@ -58,31 +108,47 @@ class RiotClient:
         """
         headers = self._get_headers()
         
-        # Apply rate limiting
+        # Apply rate limiting (waits for an in-flight slot under the AIMD cap)
         await rate_limited_request(endpoint_name)
-        
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            client = self._get_http_client()
+            retry_after = 1.0
+            for attempt in range(self.MAX_RATE_LIMIT_RETRIES):
                 response = await client.get(url, headers=headers)
-                
+
                 # Update rate limiter with response info
                 update_rate_limiter_from_response(response.status_code, dict(response.headers))
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None  # Not found
-                elif response.status_code == 403:
-                    raise ValueError("Invalid or expired API key")
-                elif response.status_code == 429:
-                    raise ValueError("Rate limit exceeded")
-                else:
-                    response.raise_for_status()
-                    
+
+                if response.status_code != 429:
+                    break
+
+                # Riot says back off: honor Retry-After plus jitter so
+                # concurrent workers don't retry in lockstep
+                retry_after = float(response.headers.get("Retry-After", retry_after))
+                if attempt + 1 < self.MAX_RATE_LIMIT_RETRIES:
+                    await asyncio.sleep(retry_after + random.uniform(0, 0.25))
+
+            if response.status_code == 200:
+                # orjson decodes Riot's JSON payloads several times faster
+                # than the stdlib decoder behind response.json()
+                return orjson.loads(response.content)
+            elif response.status_code == 404:
+                return None  # Not found
+            elif response.status_code == 403:
+                raise ValueError("Invalid or expired API key")
+            elif response.status_code == 429:
+                raise RiotRateLimitError(retry_after)
+            else:
+                response.raise_for_status()
+
         except httpx.TimeoutException:
             raise ValueError("Request timed out")
         except httpx.RequestError as e:
             raise ValueError(f"Request failed: {str(e)}")
+        finally:
+            # Free the concurrency slot whether the call succeeded or not
+            await release_request()
     
     def _get_regional_base_url(self, region: str) -> str:
         """Get the regional API base URL"""
@@ -130,7 +196,8 @@ class RiotClient:
         """
         # First, get the account information using Riot ID
         account_data = await self.get_account_by_riot_id(game_name, tag_line, region)
-        print(f"ACCOUNT DATA: {account_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Account data: %s", account_data)
         if not account_data:
             return None
         
@@ -143,8 +210,10 @@ class RiotClient:
         if not summoner_data:
             return None
         
-        print(f"SUMMONER DATA: {summoner_data}")
-        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Summoner data: %s", summoner_data)
+
+
         # Combine the data for a complete response
         return {
             **summoner_data,
@@ -172,20 +241,20 @@ class RiotClient:
         headers = self._get_headers()
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+            client = self._get_http_client()
+            response = await client.get(url, headers=headers)
 
-                print(f"DEPRECATED ENDPOINT RESPONSE: {response.status_code}")
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None  # Summoner not found
-                elif response.status_code == 403:
-                    raise ValueError("Invalid or expired API key, or endpoint is deprecated/restricted")
-                elif response.status_code == 429:
-                    raise ValueError("Rate limit exceeded")
-                else:
-                    response.raise_for_status()
+            logger.debug("Deprecated by-name endpoint response: %s", response.status_code)
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            elif response.status_code == 404:
+                return None  # Summoner not found
+            elif response.status_code == 403:
+                raise ValueError("Invalid or expired API key, or endpoint is deprecated/restricted")
+            elif response.status_code == 429:
+                raise ValueError("Rate limit exceeded")
+            else:
+                response.raise_for_status()
                     
         except httpx.TimeoutException:
             raise ValueError("Request timed out")
@@ -241,11 +310,11 @@ class RiotClient:
         Get the latest Data Dragon version
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get("https://ddragon.leagueoflegends.com/api/versions.json")
-                response.raise_for_status()
-                versions = response.json()
-                return versions[0]  # First version is the latest
+            client = self._get_http_client()
+            response = await client.get("https://ddragon.leagueoflegends.com/api/versions.json")
+            response.raise_for_status()
+            versions = orjson.loads(response.content)
+            return versions[0]  # First version is the latest
         except Exception:
             return "15.17.1"  # Fallback to known working version
     
@@ -258,10 +327,10 @@ class RiotClient:
             latest_version = await self.get_latest_version()
             url = f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.json()
+            client = self._get_http_client()
+            response = await client.get(url)
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except Exception:
             return None
     
@@ -365,4 +434,16 @@ class RiotClient:
             
         except Exception as e:
             print(f"Error checking if player in game: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+# Shared instance for FastAPI dependencies; RiotClient keeps no per-request
+# state, so one object can serve every endpoint
+_riot_client: Optional[RiotClient] = None
+
+
+def get_riot_client() -> RiotClient:
+    """Get the shared RiotClient (use via Depends in endpoints)"""
+    global _riot_client
+    if _riot_client is None:
+        _riot_client = RiotClient()
+    return _riot_client
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import Optional
 from datetime import datetime
 
@@ -26,7 +27,30 @@ class SummonerService:
             )
         )
         return result.scalar_one_or_none()
-    
+
+    @staticmethod
+    async def get_summoner_row_by_riot_id(db: AsyncSession, game_name: str, tag_line: str):
+        """Get the lookup columns for a summoner by Riot ID as a Core row
+
+        The lookup endpoint only reads a few columns, so this skips ORM
+        hydration (identity map, instance state, relationship proxies) and
+        returns a plain Row, or None if not stored.
+        """
+        result = await db.execute(
+            select(
+                Summoner.puuid,
+                Summoner.game_name,
+                Summoner.tag_line,
+                Summoner.summoner_level,
+                Summoner.revision_date,
+                Summoner.region,
+            ).where(
+                Summoner.game_name == game_name,
+                Summoner.tag_line == tag_line
+            )
+        )
+        return result.first()
+
     @staticmethod
     async def create_or_update_summoner(
         db: AsyncSession,
@@ -40,49 +64,48 @@ class SummonerService:
         account_id: Optional[str] = None,
         profile_icon_id: Optional[int] = None
     ) -> Summoner:
-        """Create a new summoner or update existing one"""
-        
-        # Check if summoner already exists
-        existing_summoner = await SummonerService.get_summoner_by_puuid(db, puuid)
-        
-        if existing_summoner:
-            # Update existing summoner
-            existing_summoner.game_name = game_name
-            existing_summoner.tag_line = tag_line
-            existing_summoner.summoner_level = summoner_level
-            existing_summoner.revision_date = revision_date
-            existing_summoner.region = region
-            existing_summoner.last_updated = datetime.utcnow()
-            
-            if summoner_id:
-                existing_summoner.summoner_id = summoner_id
-            if account_id:
-                existing_summoner.account_id = account_id
-            if profile_icon_id:
-                existing_summoner.profile_icon_id = profile_icon_id
-            
-            await db.commit()
-            await db.refresh(existing_summoner)
-            return existing_summoner
-        else:
-            # Create new summoner
-            new_summoner = Summoner(
-                puuid=puuid,
-                game_name=game_name,
-                tag_line=tag_line,
-                summoner_level=summoner_level,
-                revision_date=revision_date,
-                region=region,
-                summoner_id=summoner_id,
-                account_id=account_id,
-                profile_icon_id=profile_icon_id,
-                is_active=True
-            )
-            
-            db.add(new_summoner)
-            await db.commit()
-            await db.refresh(new_summoner)
-            return new_summoner
+        """Create a new summoner or update existing one
+
+        Runs as a single atomic UPSERT (INSERT ... ON CONFLICT DO UPDATE)
+        instead of SELECT-then-branch, so the write is one round trip and
+        can't race a concurrent insert for the same puuid.
+        """
+        stmt = sqlite_insert(Summoner).values(
+            puuid=puuid,
+            game_name=game_name,
+            tag_line=tag_line,
+            summoner_level=summoner_level,
+            revision_date=revision_date,
+            region=region,
+            summoner_id=summoner_id,
+            account_id=account_id,
+            profile_icon_id=profile_icon_id,
+            is_active=True,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["puuid"],
+            set_={
+                "game_name": stmt.excluded.game_name,
+                "tag_line": stmt.excluded.tag_line,
+                "summoner_level": stmt.excluded.summoner_level,
+                "revision_date": stmt.excluded.revision_date,
+                "region": stmt.excluded.region,
+                # Optional identifiers keep their stored value when the
+                # caller didn't supply a fresh one (old if-guard behavior)
+                "summoner_id": func.coalesce(stmt.excluded.summoner_id, Summoner.summoner_id),
+                "account_id": func.coalesce(stmt.excluded.account_id, Summoner.account_id),
+                "profile_icon_id": func.coalesce(stmt.excluded.profile_icon_id, Summoner.profile_icon_id),
+                # Core DML bypasses the ORM-level onupdate, so bump it here
+                "last_updated": func.now(),
+            },
+        ).returning(Summoner)
+
+        result = await db.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        summoner = result.scalar_one()
+        await db.commit()
+        return summoner
     
     @staticmethod
     async def update_summoner_last_seen(db: AsyncSession, puuid: str) -> bool:
@@ -96,9 +119,13 @@ class SummonerService:
         return result.rowcount > 0
     
     @staticmethod
-    def summoner_to_response(summoner: Summoner) -> SummonerResponse:
-        """Convert Summoner model to SummonerResponse schema"""
-        return SummonerResponse(
+    def summoner_to_response(summoner) -> SummonerResponse:
+        """Convert a Summoner model or lookup Row to SummonerResponse schema
+
+        The source is our own stored/validated data, so the DTO is built
+        with model_construct to skip a redundant field-validation pass.
+        """
+        return SummonerResponse.model_construct(
             puuid=summoner.puuid,
             game_name=summoner.game_name,
             tag_line=summoner.tag_line,